@@ -1,35 +1,54 @@
 import frappe
+from api_explorer.core.cache.manager import TieredCache
+from api_explorer.core.catalog.search import substring_search
+from api_explorer.core.scanner.records import parse_fields, project
+from api_explorer.core.scanner.scheduler_scanner import with_job_stats
 
-# Global cache
-_cache = {}
+# One entry per app and category, shared by all users and versioned by settings and catalog
+_slices = TieredCache('pagination', ttl=600, max_bytes=32 * 1024 * 1024, shared=False)
 
 @frappe.whitelist()
-def get_paginated_apis(app_name, category, page=1, search_query=""):
+def get_paginated_apis(app_name, category, page=1, search_query="", cursor=None, sort_by=None, sort_order="asc", fields=None):
+    # Validated outside the try so a bad argument is an error response, not an empty page
+    fields = parse_fields(fields)
     try:
+        from api_explorer.core.auth.manager import AuthManager
+        from api_explorer.core.catalog.manager import CatalogManager
+        from api_explorer.core.config.manager import ConfigManager
+        from api_explorer.core.scanner.manager import APIScanner, enqueue_search_index_build
+        
         page = max(1, int(page or 1))
-        cache_key = f"apis_all_{frappe.session.user}_{app_name}_{category}"
+        settings = ConfigManager.get_settings()
+        scanner = APIScanner(settings)
+        user_context = AuthManager.get_current_user_context()
         
-        if cache_key in _cache:
-            apis, settings = _cache[cache_key]
-        else:
-            from api_explorer.core.config.manager import ConfigManager
-            from api_explorer.core.scanner.manager import APIScanner
-            
-            settings = ConfigManager.get_settings()
-            scanner = APIScanner()
-            result = scanner.scan_all_apis()
-            
-            try:
-                apis = result['apps'][app_name][category]
-            except KeyError:
-                apis = []
+        table_page = get_table_page(scanner, user_context, app_name, category, page, search_query, cursor, sort_by, sort_order, fields)
+        if table_page:
+            return table_page
+        
+        cache_key = f"{app_name}::{category}"
+        version = (CatalogManager.get_settings_fingerprint(settings), CatalogManager.get_version(settings))
+        entry = _slices.get(cache_key, version) if scanner.is_listed(app_name, category, user_context) else {'apis': []}
+        cacheable = True
+        
+        if entry is None:
+            # Only the requested app and category are read, or scanned if not cached yet
+            entry = {'apis': scanner.get_app_apis(app_name, category, user_context)}
             
-            _cache[cache_key] = (apis, settings)
-            frappe.enqueue('api_explorer.api.pagination.clear_cache', cache_key=cache_key, queue='short', timeout=300)
+            cacheable = not scanner.file_scanner.incomplete_apps
+            if cacheable:
+                _slices.set(cache_key, entry, version)
+        
+        apis = entry['apis']
+        if search_query and apis:
+            # Indexes are built by the rebuild job; until one is there the slice is filtered without it
+            index = CatalogManager.get_search_index(settings, app_name, category, version[1]) if cacheable else None
+            if index is None and cacheable and version[1]:
+                enqueue_search_index_build(app_name, category)
+            apis = index.search(search_query.strip()) if index else substring_search(apis, search_query)
         
-        if search_query:
-            search_lower = search_query.lower()
-            apis = [api for api in apis if search_lower in api.get('name', '').lower() or search_lower in api.get('path', '').lower()]
+        if sort_by in ('name', 'path'):
+            apis = sorted(apis, key=lambda api: (api.get(sort_by) or '').lower(), reverse=sort_order == 'desc')
         
         total_items = len(apis)
         page_size = settings.get('items_per_page', 20)
@@ -39,13 +58,13 @@ def get_paginated_apis(app_name, category, page=1, search_query=""):
             return {'apis': [], 'pagination': {'current_page': page, 'page_size': page_size, 'total_items': 0, 'total_pages': 0, 'has_next': False, 'has_prev': False}, 'settings': {'enable_pagination': pagination_enabled}}
         
         if not pagination_enabled:
-            return {'apis': apis, 'pagination': {'current_page': 1, 'page_size': total_items, 'total_items': total_items, 'total_pages': 1, 'has_next': False, 'has_prev': False}, 'settings': {'enable_pagination': False}}
+            return {'apis': project_page(apis, category, fields), 'pagination': {'current_page': 1, 'page_size': total_items, 'total_items': total_items, 'total_pages': 1, 'has_next': False, 'has_prev': False}, 'settings': {'enable_pagination': False}}
         
         total_pages = -(-total_items // page_size)
         start_idx = (page - 1) * page_size
         
         return {
-            'apis': apis[start_idx:start_idx + page_size],
+            'apis': project_page(apis[start_idx:start_idx + page_size], category, fields),
             'pagination': {
                 'current_page': page,
                 'page_size': page_size,
@@ -60,5 +79,35 @@ def get_paginated_apis(app_name, category, page=1, search_query=""):
         frappe.log_error(f"Pagination error: {str(e)}")
         return {'apis': [], 'pagination': {'current_page': 1, 'page_size': 20, 'total_items': 0, 'total_pages': 0, 'has_next': False, 'has_prev': False}, 'settings': {'enable_pagination': True}}
 
-def clear_cache(cache_key):
-    _cache.pop(cache_key, None)
\ No newline at end of file
+def project_page(apis, category, fields=None):
+    # Scheduler run statistics aren't stored with the catalog; only the APIs on the page are joined with them
+    if category == 'schedulers':
+        apis = with_job_stats(apis)
+    return project(apis, fields)
+
+def get_table_page(scanner, user_context, app_name, category, page, search_query, cursor, sort_by, sort_order, fields=None):
+    """Serve the page with an indexed query when the catalog is materialized in the database"""
+    settings = scanner.settings
+    if settings.get('catalog_storage') != 'Database' or not settings.get('enable_pagination', 1):
+        return None
+    
+    page_size = settings.get('items_per_page', 20)
+    result = scanner.get_app_api_page(app_name, category, page_size, page=page, cursor=cursor,
+        search_query=(search_query or '').strip(), sort_by=sort_by or 'name', sort_order=sort_order, user_context=user_context)
+    if result is None:
+        return None  # Table not synced for these settings yet, fall back to the cached catalog
+    
+    total_items = result['total_items']
+    return {
+        'apis': project_page(result['apis'], category, fields),
+        'pagination': {
+            'current_page': page,
+            'page_size': page_size,
+            'total_items': total_items,
+            'total_pages': -(-total_items // page_size),
+            'has_next': result['has_next'],
+            'has_prev': page > 1,
+            'next_cursor': result['next_cursor']
+        },
+        'settings': {'enable_pagination': True}
+    }
\ No newline at end of file
@@ -3,8 +3,11 @@ import frappe
 @frappe.whitelist(allow_guest=True)
 def get_settings():
     try:
+        from api_explorer.core.cache.manager import get_generation
         from api_explorer.core.config.manager import ConfigManager
-        return ConfigManager.get_settings()
+        
+        # Other responses reference the settings by this version instead of repeating them
+        return dict(ConfigManager.get_settings(), settings_version=get_generation())
     except Exception as e:
         frappe.log_error(f"Get settings error: {str(e)}")
         return ConfigManager.get_default_settings()
\ No newline at end of file
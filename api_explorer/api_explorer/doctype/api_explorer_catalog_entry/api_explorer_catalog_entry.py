@@ -0,0 +1,10 @@
+import frappe
+from frappe.model.document import Document
+
+class APIExplorerCatalogEntry(Document):
+	pass
+
+def on_doctype_update():
+	# Keyset pagination walks (app, category, sort column, name) in index order
+	frappe.db.add_index("API Explorer Catalog Entry", ["app", "category", "api_name", "name"])
+	frappe.db.add_index("API Explorer Catalog Entry", ["app", "category", "api_path", "name"])
@@ -11,4 +11,17 @@ class APIExplorerSettings(Document):
 		# Normalize excluded methods to lowercase
 		for row in self.get("excluded_api_methods", []):
 			if row.method_path:
-				row.method_path = row.method_path.lower().strip()
\ No newline at end of file
+				row.method_path = row.method_path.lower().strip()
+	
+	def on_update(self):
+		# Only once the save is committed; a request reading the old values under a new generation would cache them
+		frappe.db.after_commit.add(invalidate_caches)
+
+def invalidate_caches():
+	# Invalidate every API Explorer cache entry (settings, catalog, worker caches) at once
+	from api_explorer.core.cache.manager import bump_generation
+	bump_generation()
+	
+	# Pre-build the catalog for the new values
+	from api_explorer.core.scanner.manager import enqueue_catalog_rebuild
+	enqueue_catalog_rebuild()
@@ -1,29 +1,63 @@
 import frappe
+from api_explorer.core.cache.manager import cache_key
+
+# Roles, user type and computed permissions change rarely, so they are kept per user in redis
+USER_CONTEXT_KEY = 'api_explorer_user_context'
+USER_CONTEXT_TTL = 1800
 
 class AuthManager:
     @staticmethod
     def get_current_user_context():
+        """Resolve the current user's context once per request; roles and permissions are cached per user, session fields never"""
         try:
             if frappe.session.user == "Guest":
                 return {"authenticated": False, "user": None, "roles": [], "permissions": {}}
             
             user = frappe.session.user
-            roles = frappe.get_roles(user)
-            user_doc = frappe.get_doc("User", user)
+            context = getattr(frappe.local, 'api_explorer_user_context', None)
+            if context and context["user"] == user:
+                return context
             
-            return {
-                "authenticated": True,
-                "user": user,
-                "user_type": user_doc.user_type,
-                "roles": roles,
-                "permissions": AuthManager._get_user_permissions(user, roles),
-                "session_id": frappe.session.sid,
-                "csrf_token": frappe.sessions.get_csrf_token() if hasattr(frappe.sessions, 'get_csrf_token') else None
-            }
+            context = dict(
+                AuthManager._get_cached_user_context(user),
+                session_id=frappe.session.sid,
+                csrf_token=frappe.sessions.get_csrf_token() if hasattr(frappe.sessions, 'get_csrf_token') else None
+            )
+            frappe.local.api_explorer_user_context = context
+            return context
         except Exception as e:
             frappe.log_error(f"Auth context error: {str(e)}")
             return {"authenticated": False, "user": None, "roles": [], "permissions": {}}
     
+    @staticmethod
+    def _get_cached_user_context(user):
+        key = AuthManager.user_context_key(user)
+        cached = frappe.cache().get_value(key)
+        if cached:
+            return cached
+        
+        roles = frappe.get_roles(user)
+        context = {
+            "authenticated": True,
+            "user": user,
+            "user_type": frappe.db.get_value("User", user, "user_type"),
+            "roles": roles,
+            "permissions": AuthManager._get_user_permissions(user, roles)
+        }
+        frappe.cache().set_value(key, context, expires_in_sec=USER_CONTEXT_TTL)
+        return context
+    
+    @staticmethod
+    def user_context_key(user):
+        return cache_key(f"{USER_CONTEXT_KEY}::{user}")
+    
+    @staticmethod
+    def clear_user_context(user):
+        frappe.cache().delete_value(AuthManager.user_context_key(user))
+        context = getattr(frappe.local, 'api_explorer_user_context', None)
+        if context and context["user"] == user:
+            frappe.local.api_explorer_user_context = None
+    
     @staticmethod
     def _get_user_permissions(user, roles):
         from api_explorer.core.config.manager import ConfigManager
@@ -74,4 +108,16 @@ def get_current_user_context():
         return AuthManager.get_current_user_context()
     except Exception as e:
         frappe.log_error(f"Get user context error: {str(e)}")
-        return {"authenticated": False, "user": None, "roles": [], "permissions": {}}
\ No newline at end of file
+        return {"authenticated": False, "user": None, "roles": [], "permissions": {}}
+
+def clear_user_context(doc, method=None):
+    """User on_update/on_trash hook: roles and user type are edited on the User form"""
+    user = doc.name
+    # After the save commits, or a request running meanwhile would re-cache the old roles
+    frappe.db.after_commit.add(lambda: _drop_user_context(user))
+
+def _drop_user_context(user):
+    try:
+        AuthManager.clear_user_context(user)
+    except Exception as e:
+        frappe.log_error(f"User context cache clear error: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,172 @@
+import frappe
+import pickle
+import sys
+import time
+import tracemalloc
+from api_explorer.core.scanner.records import APIRecord
+
+# Run with: bench --site <site> execute api_explorer.core.benchmarks.<benchmark>
+# Run benchmark_discovery_engines in a fresh process so the registry timing includes module imports
+# benchmark_filter takes the rule count, e.g. --kwargs "{'rules': 1000}"
+
+# Parameter signatures the synthetic APIs cycle through
+SIGNATURES = [(('doctype', 'string', True), ('name', 'string', True)), (('filters', 'object', False),), ()]
+VERBS = ['get', 'set', 'create', 'update', 'delete', 'validate', 'make', 'fetch']
+NOUNS = ['invoice', 'customer', 'item', 'payment', 'order', 'stock', 'account', 'employee']
+
+def synthetic_module(i):
+    return f"erpnext.module_{i % 50}.doctype.doctype_{i % 400}.doctype_{i % 400}"
+
+def synthetic_sources(count, searchable=False):
+    """(name, path, params, file_path, line) for `count` ERPNext-shaped APIs"""
+    for i in range(count):
+        module = synthetic_module(i)
+        name = f"{VERBS[i % len(VERBS)]}_{NOUNS[(i // 8) % len(NOUNS)]}_{i}" if searchable else f"method_{i}"
+        yield name, f"{module}.{name}", SIGNATURES[i % len(SIGNATURES)], f"/apps/erpnext/{module.replace('.', '/')}.py", i
+
+def synthetic_apis(count, searchable=False):
+    return [APIRecord(name, path, params, file_path, line, True, i % 3 == 0)
+        for i, (name, path, params, file_path, line) in enumerate(synthetic_sources(count, searchable))]
+
+def timed(fn, repeat=5):
+    """Result of the last call and the mean duration in milliseconds"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, round((time.perf_counter() - start) / repeat * 1000, 3)
+
+def benchmark_codec(count=10000):
+    """Compare pickle and the catalog codec on a synthetic catalog slice"""
+    from api_explorer.core.catalog.codec import ORJSON_AVAILABLE, dumps, loads, pack_apis, unpack_apis
+    
+    count = int(count)
+    apis = synthetic_apis(count)
+    entry = {'fingerprint': 'benchmark', 'apis': apis}
+    
+    pickled, pickle_dump_ms = timed(lambda: pickle.dumps(entry))
+    _, pickle_load_ms = timed(lambda: pickle.loads(pickled))
+    encoded, codec_dump_ms = timed(lambda: dumps({'fingerprint': 'benchmark', 'apis': pack_apis(apis)}))
+    _, codec_load_ms = timed(lambda: unpack_apis(loads(encoded)['apis']))
+    
+    return {
+        "apis": count,
+        "orjson": ORJSON_AVAILABLE,
+        "pickle": {"bytes": len(pickled), "dump_ms": pickle_dump_ms, "load_ms": pickle_load_ms},
+        "codec": {"bytes": len(encoded), "dump_ms": codec_dump_ms, "load_ms": codec_load_ms}
+    }
+
+def benchmark_search(count=20000):
+    """Compare the search index with a linear substring scan"""
+    from api_explorer.core.catalog.search import SearchIndex
+    
+    count = int(count)
+    apis = synthetic_apis(count, searchable=True)
+    index, build_ms = timed(lambda: SearchIndex(apis), repeat=1)
+    
+    queries = ['get_invoice_12', 'payment', 'cust', 'doctype_17', 'module_3 stock', 'custmer', 'filters', 'zz']
+    
+    def per_query(search, repeat=20):
+        _, total_ms = timed(lambda: [search(query) for query in queries], repeat)
+        return round(total_ms / len(queries), 3)
+    
+    def linear(query):
+        query = query.lower()
+        return [api for api in apis if query in api.get('name', '').lower() or query in api.get('path', '').lower()]
+    
+    return {
+        "apis": count,
+        "build_ms": build_ms,
+        "index_bytes": index.nbytes(),
+        "index_query_ms": per_query(index._search),
+        "index_cached_query_ms": per_query(index.search),
+        "linear_query_ms": per_query(linear),
+        "results": {query: len(index.search(query)) for query in queries}
+    }
+
+def benchmark_record_memory(count=10000):
+    """Compare bytes per API for dict records and APIRecord"""
+    count = int(count)
+    # Interned before measuring, so neither variant is charged for the source strings APIRecord would intern
+    sources = [(sys.intern(name), sys.intern(path), params, sys.intern(file_path), line)
+        for name, path, params, file_path, line in synthetic_sources(count)]
+    
+    def measure(build):
+        tracemalloc.start()
+        records = [build(*source) for source in sources]
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return records, size
+    
+    dict_records, dict_bytes = measure(lambda name, path, params, file_path, line: {
+        "name": name, "path": path, "location": path, "docstring": "",
+        "parameters": [{"name": p[0], "type": p[1], "required": p[2], "description": "", "default_value": ""} for p in params],
+        "file_path": file_path, "line_number": line, "is_whitelisted": True, "allow_guest": False
+    })
+    compact_records, compact_bytes = measure(lambda name, path, params, file_path, line: APIRecord(name, path, params, file_path, line, True))
+    
+    return {
+        "apis": count,
+        "dict_bytes_per_api": round(dict_bytes / count),
+        "record_bytes_per_api": round(compact_bytes / count),
+        "dict_pickle_bytes_per_api": round(len(pickle.dumps(dict_records)) / count),
+        "record_pickle_bytes_per_api": round(len(pickle.dumps(compact_records)) / count)
+    }
+
+def benchmark_filter(functions=10000, rules=1000):
+    """Compare the compiled filter with checking every prefix rule per function"""
+    from api_explorer.core.scanner.filters import MethodFilter
+    
+    functions, rules = int(functions), int(rules)
+    paths = [path for _, path, _, _, _ in synthetic_sources(functions)]
+    prefixes = [f"erpnext.module_{i % 60}.doctype.doctype_{i}." for i in range(rules)]
+    # A few glob rules on top, as an admin would add them
+    globs = ["*.test_*", "erpnext.module_7.*.validate_*", "*.doctype_39?.*.method_1?"]
+    
+    method_filter, compile_ms = timed(lambda: MethodFilter(tuple(prefixes + globs)), repeat=1)
+    excluded, filter_ms = timed(lambda: sum(1 for path in paths if method_filter.is_excluded(path)), repeat=1)
+    linear_excluded, linear_ms = timed(lambda: sum(1 for path in paths if any(path.startswith(prefix) for prefix in prefixes)), repeat=1)
+    
+    return {
+        "functions": functions,
+        "rules": len(prefixes) + len(globs),
+        "compile_ms": compile_ms,
+        "filter_ms": filter_ms,
+        "linear_prefix_ms": linear_ms,
+        "excluded": excluded,
+        "linear_excluded": linear_excluded
+    }
+
+def benchmark_discovery_engines(apps=None):
+    """Compare cost and coverage of the AST and registry engines"""
+    from api_explorer.core.config.manager import ConfigManager
+    from api_explorer.core.scanner.file_scanner import FileScanner
+    from api_explorer.core.scanner.index import ScanIndex
+    from api_explorer.core.scanner.registry_scanner import RegistryScanner
+    
+    settings = dict(ConfigManager.get_settings() or {}, scan_time_budget=0, max_apis_per_app=10 ** 9)
+    apps = frappe.parse_json(apps) if isinstance(apps, str) else (apps or frappe.get_installed_apps())
+    
+    def collect(scanner):
+        start = time.perf_counter()
+        paths = {func_info.path for app, category, func_info in scanner.iter_apis(apps) if category != 'resource'}
+        return paths, round(time.perf_counter() - start, 3)
+    
+    for app in apps:
+        ScanIndex(app, frappe.get_app_path(app)).clear()
+    
+    ast_cold, ast_cold_time = collect(FileScanner(settings))
+    _, ast_warm_time = collect(FileScanner(settings))
+    registry, registry_time = collect(RegistryScanner(settings))
+    
+    return {
+        "apps": apps,
+        "ast": {"apis": len(ast_cold), "cold_seconds": ast_cold_time, "warm_seconds": ast_warm_time},
+        "registry": {"apis": len(registry), "seconds": registry_time},
+        "coverage": {
+            "both": len(ast_cold & registry),
+            "ast_only": len(ast_cold - registry),
+            "registry_only": len(registry - ast_cold),
+            "registry_only_sample": sorted(registry - ast_cold)[:20],
+            "ast_only_sample": sorted(ast_cold - registry)[:20]
+        }
+    }
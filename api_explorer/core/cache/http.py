@@ -0,0 +1,29 @@
+import frappe
+import hashlib
+
+def make_etag(*parts):
+    """Strong validator for a response determined entirely by `parts`"""
+    return '"' + hashlib.sha1('::'.join(str(part) for part in parts).encode()).hexdigest()[:20] + '"'
+
+def set_response_header(name, value):
+    # frappe copies frappe.local.response_headers onto the outgoing response
+    headers = getattr(frappe.local, 'response_headers', None)
+    if headers is not None:
+        headers[name] = value
+
+def is_not_modified(etag):
+    """Send `etag` with the response; True if the client already holds this version and gets an empty 304"""
+    set_response_header('ETag', etag)
+    # Revalidate on every use; the version check is cheap and the body may be large
+    set_response_header('Cache-Control', 'private, no-cache')
+    
+    header = frappe.get_request_header('If-None-Match') if getattr(frappe, 'request', None) else None
+    if not header:
+        return False
+    
+    # Proxies that compress the body weaken the tag (W/"..."), which still names the same version
+    candidates = {tag.strip().removeprefix('W/') for tag in header.split(',')}
+    if etag in candidates or '*' in candidates:
+        frappe.local.response.http_status_code = 304
+        return True
+    return False
@@ -0,0 +1,156 @@
+import frappe
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+# Site-wide counter every API Explorer cache key is namespaced under; bumping it invalidates them all
+GENERATION_KEY = 'api_explorer_cache_generation'
+
+def get_generation():
+    """Current cache generation, read from redis once per request or job"""
+    generation = getattr(frappe.local, 'api_explorer_cache_generation', None)
+    if generation is None:
+        try:
+            cache = frappe.cache()
+            generation = int(cache.get(cache.make_key(GENERATION_KEY)) or 0)
+        except Exception as e:
+            frappe.log_error(f"Cache generation read error: {str(e)}", "API Explorer")
+            generation = 0
+        frappe.local.api_explorer_cache_generation = generation
+    return generation
+
+def bump_generation():
+    """Invalidate every API Explorer cache entry for all users and workers in O(1); old entries expire through their TTLs"""
+    cache = frappe.cache()
+    generation = cache.incr(cache.make_key(GENERATION_KEY))
+    frappe.local.api_explorer_cache_generation = generation
+    return generation
+
+def _pickled_size(value):
+    return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+def cache_key(name):
+    return f"{name}::g{get_generation()}"
+
+class TieredCache:
+    """Bounded two-tier cache: a process-local LRU in front of redis"""
+    _instances = []
+    
+    def __init__(self, namespace, ttl=300, max_bytes=DEFAULT_MAX_BYTES, shared=True, codec=None, size_of=None):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.shared = shared
+        # Module with dumps/loads for the redis tier (e.g. the catalog codec); pickle when unset
+        self.codec = codec
+        # In-memory size of a value for the byte budget, for values much larger than their pickled form
+        self.size_of = size_of
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        TieredCache._instances.append(self)
+    
+    def redis_key(self, key):
+        return cache_key(f"api_explorer_cache::{self.namespace}::{key}")
+    
+    @staticmethod
+    def _local_key(key):
+        # Workers serve several sites, so local entries are scoped by site like redis keys are
+        return (getattr(frappe.local, 'site', None), get_generation(), key)
+    
+    def get(self, key, version=None):
+        local_key = self._local_key(key)
+        with self._lock:
+            entry = self._entries.get(local_key)
+            if entry:
+                expires_at, entry_version, size, value = entry
+                if entry_version == version and expires_at > time.monotonic():
+                    self._entries.move_to_end(local_key)
+                    return value
+                self._discard(local_key)
+        
+        if not self.shared:
+            return None
+        
+        try:
+            stored = frappe.cache().get_value(self.redis_key(key))
+            if not stored or stored[0] != version:
+                return None
+            value = self.codec.loads(stored[1]) if self.codec else pickle.loads(stored[1])
+        except Exception as e:
+            frappe.log_error(f"Cache read error for {self.namespace}: {str(e)}", "API Explorer")
+            return None
+        
+        if value is None:
+            return None  # Written in another format; rebuilt by the caller
+        
+        # Compressed payloads understate what the decoded value takes in memory
+        self._store_local(local_key, value, version, self._size(value, None if self.codec else len(stored[1])))
+        return value
+    
+    def set(self, key, value, version=None, size=None):
+        """Store a value; `size` overrides the pickled size used for the byte budget"""
+        if self.shared:
+            try:
+                payload = self.codec.dumps(value) if self.codec else pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+                frappe.cache().set_value(self.redis_key(key), (version, payload), expires_in_sec=self.ttl)
+                if size is None and not self.codec and not self.size_of:
+                    size = len(payload)
+            except Exception as e:
+                frappe.log_error(f"Cache write error for {self.namespace}: {str(e)}", "API Explorer")
+        
+        self._store_local(self._local_key(key), value, version, size or self._size(value))
+        return value
+    
+    def get_or_set(self, key, builder, version=None):
+        value = self.get(key, version)
+        if value is None:
+            value = builder()
+            if value is not None:
+                self.set(key, value, version)
+        return value
+    
+    def delete(self, key):
+        with self._lock:
+            self._discard(self._local_key(key))
+        if self.shared:
+            frappe.cache().delete_value(self.redis_key(key))
+    
+    def clear_local(self):
+        """Drop this process's entries for the current site, including older generations"""
+        site = getattr(frappe.local, 'site', None)
+        with self._lock:
+            for local_key in [k for k in self._entries if k[0] == site]:
+                self._discard(local_key)
+    
+    @classmethod
+    def clear_all_local(cls):
+        for cache in cls._instances:
+            cache.clear_local()
+    
+    def stats(self):
+        return {"namespace": self.namespace, "entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes}
+    
+    def _size(self, value, pickled_size=None):
+        if self.size_of:
+            return self.size_of(value)
+        return pickled_size or _pickled_size(value)
+    
+    def _store_local(self, local_key, value, version, size):
+        if size > self.max_bytes:
+            return  # Larger than the whole budget; serve it from redis or rebuild it instead
+        
+        with self._lock:
+            self._discard(local_key)
+            self._entries[local_key] = (time.monotonic() + self.ttl, version, size, value)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+    
+    def _discard(self, local_key):
+        entry = self._entries.pop(local_key, None)
+        if entry:
+            self._bytes -= entry[2]
@@ -0,0 +1,67 @@
+import json
+import sys
+import zlib
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+from api_explorer.core.scanner.records import APIRecord, share_params
+
+# Payload layout: MAGIC + format version byte + zlib-compressed compact JSON
+MAGIC = b'AEC'
+FORMAT_VERSION = 1
+HEADER = MAGIC + bytes([FORMAT_VERSION])
+COMPRESSION_LEVEL = 6
+
+def dumps(value):
+    """Serialize a cache entry to compressed compact JSON with a format header"""
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(value)
+    else:
+        payload = json.dumps(value, separators=(',', ':')).encode()
+    return HEADER + zlib.compress(payload, COMPRESSION_LEVEL)
+
+def loads(data):
+    """Deserialize a cache entry; returns None for missing or foreign-format data so callers rebuild"""
+    if not isinstance(data, bytes) or not data.startswith(HEADER):
+        return None
+    
+    try:
+        payload = zlib.decompress(data[len(HEADER):])
+        return orjson.loads(payload) if ORJSON_AVAILABLE else json.loads(payload)
+    except Exception:
+        return None
+
+def pack_apis(apis):
+    """Records become positional rows referencing shared signature and file tables; resource and scheduler dicts are kept as they are"""
+    signatures = {}
+    files = {}
+    rows = []
+    for api in apis:
+        if isinstance(api, APIRecord):
+            signature = signatures.setdefault(api.parameters, len(signatures))
+            file_index = files.setdefault(api.file_path, len(files))
+            row = [api.name, api.path, signature, file_index, api.line_number, api.is_whitelisted, api.allow_guest]
+            if api.docstring:
+                row.append(api.docstring)
+            rows.append(row)
+        else:
+            rows.append(api)
+    
+    return {
+        'signatures': [[list(p) for p in params] for params in signatures],
+        'files': list(files),
+        'rows': rows
+    }
+
+def unpack_apis(packed):
+    signatures = [share_params(params) for params in packed['signatures']]
+    files = [sys.intern(f) if f else f for f in packed['files']]
+    intern = sys.intern
+    return [
+        APIRecord.from_shared(intern(row[0]), intern(row[1]), signatures[row[2]], files[row[3]], row[4], row[5], row[6], row[7] if len(row) > 7 else "")
+        if isinstance(row, list) else row
+        for row in packed['rows']
+    ]
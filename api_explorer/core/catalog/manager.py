@@ -0,0 +1,249 @@
+import frappe
+import hashlib
+import json
+import time
+from frappe.utils import cint
+from api_explorer.core.cache.manager import TieredCache, cache_key
+from api_explorer.core.catalog import codec
+from api_explorer.core.catalog.search import SearchIndex
+from api_explorer.core.catalog.table import CatalogTable
+from api_explorer.core.scanner.records import json_default
+
+# Settings that change what the scanner discovers; anything else is presentation only
+CATALOG_SETTINGS_FIELDS = (
+    'discovery_engine',
+    'show_public_apis',
+    'show_internal_apis',
+    'show_resource_apis',
+    'show_scheduler_jobs',
+    'max_apis_per_app',
+    'excluded_apps',
+    'excluded_api_methods',
+    'large_table_threshold'
+)
+
+# Decoded catalog per worker; redis already holds the encoded slices
+_decoded_catalog = TieredCache('catalog', ttl=24 * 3600, max_bytes=64 * 1024 * 1024, shared=False)
+# Decoded manifests per worker; a manifest never changes for its version
+_manifests = TieredCache('catalog_manifest', ttl=3600, max_bytes=16 * 1024 * 1024, shared=False)
+# Search index per app and category, built by the rebuild job; workers budget them at their in-memory size
+_search_indexes = TieredCache('search_index', ttl=24 * 3600, max_bytes=128 * 1024 * 1024, size_of=SearchIndex.nbytes)
+
+# Compare-and-delete in one step; a GET then DEL could delete a lock taken in between
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+class CatalogManager:
+    """Site-wide API catalog shared by every user"""
+    CACHE_KEY = 'api_explorer_catalog'
+    APPS_KEY = 'api_explorer_catalog_apps'
+    # Not namespaced by cache generation, so a bump never lets a second rebuild start
+    LOCK_KEY = 'api_explorer_catalog_rebuild_lock'
+    # Upper bound for one rebuild; the lock frees itself if a worker dies mid-build
+    LOCK_TTL = 1800
+    # After the soft TTL the catalog is still served while a refresh runs in the background
+    DEFAULT_SOFT_TTL = 300
+    # After the hard TTL the catalog is dropped and readers wait for a rebuild
+    DEFAULT_HARD_TTL = 24 * 3600
+    # A partial catalog expires quickly so the next build resumes the scan
+    PARTIAL_CACHE_TTL = 30
+    # Per-version API hashes for delta sync. Versions are content hashes, so these are
+    # valid across cache generations and clients can still sync after a cache clear
+    MANIFEST_KEY = 'api_explorer_catalog_manifest::'
+    MANIFEST_TTL = 7 * 24 * 3600
+    
+    @staticmethod
+    def get_settings_fingerprint(settings):
+        scoped = {field: settings.get(field) for field in CATALOG_SETTINGS_FIELDS}
+        return hashlib.sha1(json.dumps(scoped, sort_keys=True, default=str).encode()).hexdigest()[:16]
+    
+    @staticmethod
+    def compute_version(apps):
+        return hashlib.sha1(json.dumps(apps, sort_keys=True, default=json_default).encode()).hexdigest()[:16]
+    
+    @staticmethod
+    def get_ttls(settings):
+        soft_ttl = cint(settings.get('catalog_soft_ttl')) or CatalogManager.DEFAULT_SOFT_TTL
+        hard_ttl = cint(settings.get('catalog_hard_ttl')) or CatalogManager.DEFAULT_HARD_TTL
+        return soft_ttl, max(soft_ttl, hard_ttl)
+    
+    @staticmethod
+    def get_catalog(settings):
+        """The cached catalog if it was built for the current settings, with `stale` set once past the soft TTL"""
+        cached = CatalogManager.get_catalog_meta(settings)
+        if not cached:
+            return None
+        
+        complete = cached.get('complete', True)
+        apps = _decoded_catalog.get('apps', version=cached['version']) if complete else None
+        if apps is None:
+            apps = {}
+            for field, data in (frappe.cache().hgetall(cache_key(CatalogManager.APPS_KEY)) or {}).items():
+                if isinstance(field, bytes):
+                    field = field.decode()
+                app, category = field.split('::', 1)
+                entry = codec.loads(data)
+                if entry and entry.get('fingerprint') == cached['fingerprint']:
+                    apps.setdefault(app, {})[category] = codec.unpack_apis(entry['apis'])
+            
+            # A partial catalog may gain slices without a new version, so only complete ones are kept
+            if complete:
+                _decoded_catalog.set('apps', apps, version=cached['version'])
+        
+        cached['apps'] = apps
+        return cached
+    
+    @staticmethod
+    def get_catalog_meta(settings):
+        """Catalog version, build time and freshness without reading any APIs"""
+        cached = frappe.cache().get_value(cache_key(CatalogManager.CACHE_KEY))
+        if not cached or cached.get('fingerprint') != CatalogManager.get_settings_fingerprint(settings):
+            return None
+        
+        soft_ttl, hard_ttl = CatalogManager.get_ttls(settings)
+        age = time.time() - cached.get('built_ts', 0)
+        if age > hard_ttl:
+            return None
+        
+        cached['stale'] = age > soft_ttl or not cached.get('complete', True)
+        return cached
+    
+    @staticmethod
+    def get_version(settings):
+        """Version of the current catalog, or None if there is none for these settings"""
+        cached = frappe.cache().get_value(cache_key(CatalogManager.CACHE_KEY))
+        if not cached or cached.get('fingerprint') != CatalogManager.get_settings_fingerprint(settings):
+            return None
+        return cached.get('version')
+    
+    @staticmethod
+    def set_catalog(settings, apps, complete=True):
+        fingerprint = CatalogManager.get_settings_fingerprint(settings)
+        catalog = {
+            'version': CatalogManager.compute_version(apps),
+            'fingerprint': fingerprint,
+            'built_at': frappe.utils.now(),
+            'built_ts': time.time(),
+            'complete': complete
+        }
+        
+        cache = frappe.cache()
+        previous = {field.decode() if isinstance(field, bytes) else field for field in cache.hkeys(cache_key(CatalogManager.APPS_KEY)) or []}
+        
+        # Overwrite in place so readers never see an empty catalog mid-rebuild
+        for app, categories in apps.items():
+            for category, apis in categories.items():
+                CatalogManager.set_app_category(settings, app, category, apis, fingerprint)
+                previous.discard(f"{app}::{category}")
+        
+        for field in previous:
+            cache.hdel(cache_key(CatalogManager.APPS_KEY), field)
+        
+        ttl = CatalogManager.get_ttls(settings)[1] if complete else CatalogManager.PARTIAL_CACHE_TTL
+        if complete:
+            # Written before the catalog points at this version, so every served version has a manifest
+            CatalogManager.set_manifest(catalog['version'], apps, CatalogManager.MANIFEST_TTL)
+        frappe.cache().set_value(cache_key(CatalogManager.CACHE_KEY), catalog, expires_in_sec=ttl)
+        
+        # Mirror complete catalogs into the table; a partial one would drop rows not scanned yet
+        try:
+            if CatalogTable.is_enabled(settings):
+                if complete:
+                    CatalogTable.sync(settings, apps)
+            elif frappe.cache().get_value(cache_key(CatalogTable.STATE_KEY)):
+                CatalogTable.clear()
+        except Exception as e:
+            frappe.log_error(f"Catalog table sync error: {str(e)}", "API Explorer")
+        
+        catalog['apps'] = apps
+        return catalog
+    
+    @staticmethod
+    def entry_hash(api):
+        return hashlib.sha1(json.dumps(api, sort_keys=True, default=json_default).encode()).hexdigest()[:10]
+    
+    @staticmethod
+    def set_manifest(version, apps, ttl):
+        """Record a hash per API for this version so clients holding it can fetch a delta"""
+        manifest = {
+            f"{app}::{category}": {api.get('path'): CatalogManager.entry_hash(api) for api in apis}
+            for app, categories in apps.items()
+            for category, apis in categories.items()
+        }
+        frappe.cache().set_value(CatalogManager.MANIFEST_KEY + version, codec.dumps(manifest), expires_in_sec=ttl)
+    
+    @staticmethod
+    def get_manifest(version):
+        """The manifest of a complete catalog version, or None once it has expired"""
+        if not version:
+            return None
+        manifest = _manifests.get(version, version=version)
+        if manifest is None:
+            manifest = codec.loads(frappe.cache().get_value(CatalogManager.MANIFEST_KEY + version))
+            if manifest is not None:
+                _manifests.set(version, manifest, version=version)
+        return manifest
+    
+    @staticmethod
+    def get_app_category(settings, app, category):
+        """Return one app's APIs for one category, or None if that slice was never built"""
+        entry = codec.loads(frappe.cache().hget(cache_key(CatalogManager.APPS_KEY), f"{app}::{category}"))
+        if entry and entry.get('fingerprint') == CatalogManager.get_settings_fingerprint(settings):
+            return codec.unpack_apis(entry['apis'])
+        return None
+    
+    @staticmethod
+    def set_app_category(settings, app, category, apis, fingerprint=None):
+        cache = frappe.cache()
+        key = cache_key(CatalogManager.APPS_KEY)
+        cache.hset(key, f"{app}::{category}", codec.dumps({
+            'fingerprint': fingerprint or CatalogManager.get_settings_fingerprint(settings),
+            'apis': codec.pack_apis(apis)
+        }))
+        # Hashes have no per-write TTL; expire the whole hash so older generations are dropped
+        cache.expire(cache.make_key(key), CatalogManager.get_ttls(settings)[1])
+    
+    @staticmethod
+    def get_search_index(settings, app, category, version):
+        """The search index of one slice of this catalog version, or None until it is built"""
+        if not version:
+            return None
+        return _search_indexes.get(f"{app}::{category}", (CatalogManager.get_settings_fingerprint(settings), version))
+    
+    @staticmethod
+    def set_search_index(settings, app, category, apis, version):
+        return _search_indexes.set(f"{app}::{category}", SearchIndex(apis), (CatalogManager.get_settings_fingerprint(settings), version))
+    
+    @staticmethod
+    def build_search_indexes(settings, catalog):
+        """Index every slice of a complete catalog, so no request builds one"""
+        for app, categories in catalog['apps'].items():
+            for category, apis in categories.items():
+                if apis:
+                    CatalogManager.set_search_index(settings, app, category, apis, catalog['version'])
+    
+    @staticmethod
+    def acquire_rebuild_lock():
+        """Single-flight guard: only the worker that sets the lock rebuilds the catalog. Returns its token, or None"""
+        try:
+            cache = frappe.cache()
+            token = frappe.generate_hash(length=20)
+            if cache.set(cache.make_key(CatalogManager.LOCK_KEY), token, nx=True, ex=CatalogManager.LOCK_TTL):
+                return token
+        except Exception as e:
+            frappe.log_error(f"Catalog lock error: {str(e)}", "API Explorer")
+        return None
+    
+    @staticmethod
+    def release_rebuild_lock(token):
+        """Delete the lock only if it still holds this token, so a rebuild that outlived the TTL can't free another's lock"""
+        try:
+            cache = frappe.cache()
+            cache.eval(RELEASE_LOCK_SCRIPT, 1, cache.make_key(CatalogManager.LOCK_KEY), token)
+        except Exception as e:
+            frappe.log_error(f"Catalog lock release error: {str(e)}", "API Explorer")
+
@@ -0,0 +1,312 @@
+import re
+import sys
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from functools import lru_cache
+from heapq import merge
+
+# Relevance tiers, highest first; a match scores the best tier it reaches
+SCORE_EXACT_NAME = 100
+SCORE_EXACT_PATH = 95
+SCORE_NAME_PREFIX = 80
+SCORE_TOKEN = 70
+SCORE_TOKEN_PREFIX = 60
+SCORE_SUBSTRING = 50
+SCORE_DETAIL_TOKEN = 40
+SCORE_DETAIL_PREFIX = 30
+SCORE_FUZZY = 25
+
+# Fuzzy matching only kicks in for longer terms that matched nothing literally, and compares them with words
+FUZZY_MIN_LENGTH = 4
+FUZZY_THRESHOLD = 0.4
+
+# A query scores at most this many APIs, best ranked first, so broad terms cost no more than selective ones
+MAX_CANDIDATES = 500
+
+RESULT_CACHE_SIZE = 64
+
+_token_pattern = re.compile(r'[a-z0-9]+')
+# Separates documents in the joined search text; never part of a search term
+_DOC_SEPARATOR = '\x00'
+# Sorts after every character that can appear in a key, so `prefix + _KEY_END` bounds a prefix range
+_KEY_END = '\U0010ffff'
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def tokenize(text):
+    """Split on dots, underscores and other separators: `frappe.client.get_list` -> frappe, client, get, list, get_list"""
+    tokens = set(_token_pattern.findall(text))
+    tokens.update(part for part in text.split('.') if part)
+    return tokens
+
+class Postings:
+    """Sorted keys with the ascending doc ids of each key packed into one array"""
+    __slots__ = ('keys', 'offsets', 'ids')
+    
+    def __init__(self, postings):
+        self.keys = sorted(postings)
+        self.offsets = array('I', [0])
+        self.ids = array('I')
+        for key in self.keys:
+            self.ids.extend(postings[key])
+            self.offsets.append(len(self.ids))
+    
+    def get(self, key):
+        position = bisect_left(self.keys, key)
+        if position < len(self.keys) and self.keys[position] == key:
+            return self.ids[self.offsets[position]:self.offsets[position + 1]]
+        return ()
+    
+    def with_prefix(self, prefix):
+        """Doc ids of every key starting with prefix; ascending per key, not overall"""
+        start = bisect_left(self.keys, prefix)
+        return self.ids[self.offsets[start]:self.offsets[bisect_left(self.keys, prefix + _KEY_END, start)]]
+    
+    def count_prefix(self, prefix):
+        start = bisect_left(self.keys, prefix)
+        return self.offsets[bisect_left(self.keys, prefix + _KEY_END, start)] - self.offsets[start]
+    
+    def nbytes(self):
+        return (sys.getsizeof(self.keys) + sum(sys.getsizeof(key) for key in self.keys)
+            + self.offsets.itemsize * len(self.offsets) + self.ids.itemsize * len(self.ids))
+
+class SearchIndex:
+    """Prebuilt search index over one list of APIs"""
+    
+    def __init__(self, apis):
+        self.apis = apis
+        # Doc ids are positions in rank order (shorter, then alphabetical name), so lower ids are better matches
+        haystacks = [f"{(api.get('name') or '').lower()}\n{(api.get('path') or '').lower()}" for api in apis]
+        order = sorted(range(len(apis)), key=lambda position: (haystacks[position].index('\n'), haystacks[position]))
+        self._ranked_apis = [apis[position] for position in order]
+        haystacks = [haystacks[position] for position in order]
+        
+        # Substring candidates are verified against one joined text instead of a string per API
+        self._text = _DOC_SEPARATOR.join(haystacks)
+        self._starts = array('I', [0])
+        for haystack in haystacks:
+            self._starts.append(self._starts[-1] + len(haystack) + 1)
+        
+        by_name = defaultdict(list)
+        by_path = defaultdict(list)
+        key_postings = defaultdict(list)
+        detail_postings = defaultdict(list)
+        gram_postings = defaultdict(list)
+        
+        for doc_id, (api, haystack) in enumerate(zip(self._ranked_apis, haystacks)):
+            name, path = haystack.split('\n', 1)
+            by_name[name].append(doc_id)
+            by_path[path].append(doc_id)
+            
+            for token in tokenize(name) | tokenize(path):
+                key_postings[token].append(doc_id)
+            
+            details = ' '.join(p.get('name') or '' for p in api.get('parameters') or [])
+            for token in tokenize(f"{details} {api.get('docstring') or ''}".lower()):
+                detail_postings[token].append(doc_id)
+            
+            # The separator suffix gives the last characters a trigram, so shorter terms can use prefixes of grams
+            for gram in trigrams(haystack + _DOC_SEPARATOR):
+                gram_postings[gram].append(doc_id)
+        
+        self._names = Postings(by_name)
+        self._paths = Postings(by_path)
+        self._key_tokens = Postings(key_postings)
+        self._detail_tokens = Postings(detail_postings)
+        self._grams = Postings(gram_postings)
+        
+        # Fuzzy matching compares terms with the words among key tokens, not with every API
+        vocabulary = defaultdict(list)
+        for token_id, token in enumerate(self._key_tokens.keys):
+            if token.isalpha():
+                for gram in trigrams(token):
+                    vocabulary[gram].append(token_id)
+        self._vocabulary = Postings(vocabulary)
+        
+        self._init_cache()
+    
+    def _init_cache(self):
+        # Paging through results repeats the same query
+        self.search = lru_cache(maxsize=RESULT_CACHE_SIZE)(self._search)
+    
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state.pop('search', None)
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_cache()
+    
+    def __len__(self):
+        return len(self.apis)
+    
+    def nbytes(self):
+        """Approximate memory held by the index, not counting the APIs it indexes"""
+        size = sys.getsizeof(self._ranked_apis) + sys.getsizeof(self._text) + self._starts.itemsize * len(self._starts)
+        return size + sum(postings.nbytes() for postings in (self._names, self._paths, self._key_tokens, self._detail_tokens, self._grams, self._vocabulary))
+    
+    def _search(self, query):
+        """Return the APIs matching every term of the query, best matches first; the list is shared and must not be modified"""
+        terms = sorted(set((query or '').lower().split()), key=lambda term: (self._estimate(term), term))
+        if not terms:
+            return list(self.apis)
+        
+        if len(terms) == 1:
+            scores = self._match_term(terms[0])
+        else:
+            scores = dict.fromkeys(self._collect(terms), 0)
+            for term in terms:
+                matches = self._match_term(term, scores)
+                scores = {doc_id: score + matches[doc_id] for doc_id, score in scores.items() if doc_id in matches}
+        
+        # One integer per match encodes (score, doc id) so the sort runs on plain ints
+        size = len(self.apis)
+        ranked = self._ranked_apis
+        keys = sorted((SCORE_EXACT_NAME * len(terms) - score) * size + doc_id for doc_id, score in scores.items())
+        return [ranked[key % size] for key in keys]
+    
+    def _estimate(self, term):
+        """Upper bound on the APIs matching the term literally, from postings sizes"""
+        grams = trigrams(term) or (term,)
+        return min(self._grams.count_prefix(gram) for gram in grams) + self._detail_tokens.count_prefix(term)
+    
+    def _match_term(self, term, within=None):
+        """Score the APIs matching one term, highest tier first: the best ranked MAX_CANDIDATES, or those in `within`"""
+        # Prefix postings are ascending per key only, so they are sorted before keeping the best ranked
+        tiers = (
+            (SCORE_EXACT_NAME, lambda: self._names.get(term), False),
+            (SCORE_EXACT_PATH, lambda: self._paths.get(term), False),
+            (SCORE_NAME_PREFIX, lambda: self._names.with_prefix(term), True),
+            (SCORE_TOKEN, lambda: self._key_tokens.get(term), False),
+            (SCORE_TOKEN_PREFIX, lambda: self._key_tokens.with_prefix(term), True),
+            (SCORE_SUBSTRING, lambda: self._substring_matches(term, within, scores), False),
+            (SCORE_DETAIL_TOKEN, lambda: self._detail_tokens.get(term), False),
+            (SCORE_DETAIL_PREFIX, lambda: self._detail_tokens.with_prefix(term), True)
+        )
+        
+        scores = {}
+        for score, find, unordered in tiers:
+            scores = self._add(scores, score, find(), within, unordered)
+            if len(scores) >= MAX_CANDIDATES:
+                return scores
+        
+        if not scores and len(term) >= FUZZY_MIN_LENGTH:
+            # Nothing matched literally, so treat the term as a possible typo
+            for token, similarity in sorted(self._fuzzy_tokens(term), key=lambda item: -item[1]):
+                scores = self._add(scores, max(1, int(SCORE_FUZZY * similarity)), self._key_tokens.get(token), within)
+                if len(scores) >= MAX_CANDIDATES:
+                    break
+        
+        return scores
+    
+    @staticmethod
+    def _add(scores, score, doc_ids, within, unordered=False):
+        """Scores with the doc ids not scored yet added at this tier's score"""
+        if within is not None:
+            doc_ids = within.keys() & doc_ids
+        elif len(scores) + len(doc_ids) > MAX_CANDIDATES:
+            if scores:
+                doc_ids, unordered = set(doc_ids).difference(scores), True
+            # Doc ids are ranks, so the lowest are the best matches of this tier
+            doc_ids = (sorted(doc_ids) if unordered else doc_ids)[:MAX_CANDIDATES - len(scores)]
+        if not doc_ids:
+            return scores
+        added = dict.fromkeys(doc_ids, score)
+        added.update(scores)
+        return added
+    
+    def _substring_matches(self, term, within=None, scored=None):
+        """Doc ids whose name or path contains the term: those in `within`, or the best ranked ones not `scored` yet"""
+        text, starts = self._text, self._starts
+        if within is not None:
+            return [doc_id for doc_id in within if text.find(term, starts[doc_id], starts[doc_id + 1]) >= 0]
+        
+        doc_ids = []
+        limit = MAX_CANDIDATES - len(scored)
+        previous = None
+        for doc_id in self._candidates(term, True, ()):
+            if doc_id != previous and doc_id not in scored and text.find(term, starts[doc_id], starts[doc_id + 1]) >= 0:
+                doc_ids.append(doc_id)
+                if len(doc_ids) >= limit:
+                    break
+            previous = doc_id
+        return doc_ids
+    
+    def _collect(self, terms):
+        """The best ranked APIs matching every term, at most MAX_CANDIDATES, so broad queries stop early"""
+        text, starts = self._text, self._starts
+        filters = [self._term_filter(term) for term in terms]
+        
+        # Candidates come from the most selective term, narrowed by the trigram postings of other selective terms
+        candidates = self._candidates(*filters[0])
+        narrowing = [filter for filter in filters[1:] if len(filter[0]) >= 3 and self._estimate(filter[0]) < len(self.apis) // 2]
+        if narrowing:
+            candidates = set(candidates)
+            for term, literal, others in narrowing:
+                candidates.intersection_update(set(self._candidates(term, literal, ())).union(others) if literal else others)
+            candidates = sorted(candidates)
+        
+        # Every term is checked per API in rank order, until enough match
+        doc_ids = []
+        previous = None
+        for doc_id in candidates:
+            if doc_id == previous:
+                continue
+            previous = doc_id
+            start, end = starts[doc_id], starts[doc_id + 1]
+            for term, literal, others in filters:
+                if not (literal and text.find(term, start, end) >= 0) and doc_id not in others:
+                    break
+            else:
+                doc_ids.append(doc_id)
+                if len(doc_ids) >= MAX_CANDIDATES:
+                    break
+        return doc_ids
+    
+    def _term_filter(self, term):
+        """(term, whether it can be in a name or path, doc ids it matches otherwise: parameters, docstrings or typos)"""
+        others = set(self._detail_tokens.with_prefix(term))
+        literal = self._estimate(term) > len(others)
+        if not literal and not others and len(term) >= FUZZY_MIN_LENGTH:
+            for token, similarity in self._fuzzy_tokens(term):
+                others.update(self._key_tokens.get(token))
+        return term, literal, others
+    
+    def _candidates(self, term, literal, others):
+        """Doc ids that may match the term, ascending, possibly repeated"""
+        others = sorted(others)
+        if not literal:
+            return others
+        if len(term) >= 3:
+            # Every literal match is in the postings of each trigram of the term; the two rarest are intersected when small
+            postings = sorted((self._grams.get(gram) for gram in trigrams(term)), key=len)
+            candidates = postings[0]
+            if len(postings) > 1 and len(candidates) <= MAX_CANDIDATES * 4:
+                candidates = sorted(set(candidates).intersection(postings[1]))
+        elif self._grams.count_prefix(term) > len(self.apis):
+            candidates = range(len(self.apis))  # A common short term is in most APIs anyway
+        else:
+            candidates = sorted(set(self._grams.with_prefix(term)))
+        return merge(candidates, others) if others else candidates
+    
+    def _fuzzy_tokens(self, term):
+        """Key tokens whose trigram overlap with the term reaches the threshold (Dice coefficient)"""
+        term_grams = trigrams(term)
+        shared = defaultdict(int)
+        for gram in term_grams:
+            for token_id in self._vocabulary.get(gram):
+                shared[token_id] += 1
+        
+        tokens = self._key_tokens.keys
+        for token_id, count in shared.items():
+            similarity = 2 * count / (len(term_grams) + max(len(tokens[token_id]) - 2, 1))
+            if similarity >= FUZZY_THRESHOLD:
+                yield tokens[token_id], similarity
+
+def substring_search(apis, query):
+    """Unindexed fallback: the APIs whose name or path contains every term of the query"""
+    terms = (query or '').lower().split()
+    return [api for api in apis if all(term in f"{api.get('name') or ''}\n{api.get('path') or ''}".lower() for term in terms)]
\ No newline at end of file
@@ -0,0 +1,150 @@
+import frappe
+import base64
+import hashlib
+import json
+from frappe.utils import cint
+from api_explorer.core.cache.manager import cache_key
+from api_explorer.core.scanner.records import APIRecord, json_default
+
+class CatalogTable:
+    """Materialized copy of the catalog in the API Explorer Catalog Entry table"""
+    DOCTYPE = 'API Explorer Catalog Entry'
+    # Fingerprint of the settings the table was last fully synced for
+    STATE_KEY = 'api_explorer_catalog_table'
+    SORT_COLUMNS = {'name': 'api_name', 'path': 'api_path'}
+    COLUMNS = ('name', 'app', 'category', 'api_name', 'api_path', 'param_count', 'is_whitelisted',
+        'allow_guest', 'file_path', 'line_number', 'content_hash', 'payload', 'creation', 'modified', 'owner', 'modified_by')
+    DELETE_CHUNK_SIZE = 500
+    
+    @staticmethod
+    def is_enabled(settings):
+        return settings.get('catalog_storage') == 'Database'
+    
+    @staticmethod
+    def is_ready(settings):
+        """True when the table holds a complete catalog for the current settings"""
+        from api_explorer.core.catalog.manager import CatalogManager
+        
+        if not CatalogTable.is_enabled(settings):
+            return False
+        return frappe.cache().get_value(cache_key(CatalogTable.STATE_KEY)) == CatalogManager.get_settings_fingerprint(settings)
+    
+    @staticmethod
+    def make_row(app, category, api, now):
+        # The payload is the list entry; details are read on demand
+        data = api.as_summary() if isinstance(api, APIRecord) else api
+        payload = json.dumps(data, separators=(',', ':'), sort_keys=True, default=json_default)
+        path = data.get('path') or ''
+        file_path, line_number = api.get('file_path'), cint(api.get('line_number'))
+        
+        return (
+            hashlib.sha1(f"{app}::{category}::{path}".encode()).hexdigest()[:20],
+            app,
+            category,
+            (data.get('name') or '')[:140],
+            path[:255],
+            data.get('param_count', len(data.get('parameters') or [])),
+            cint(data.get('is_whitelisted')),
+            cint(data.get('allow_guest')),
+            file_path,
+            line_number,
+            hashlib.sha1(f"{payload}|{file_path}|{line_number}".encode()).hexdigest()[:16],
+            payload,
+            now,
+            now,
+            'Administrator',
+            'Administrator'
+        )
+    
+    @staticmethod
+    def sync(settings, apps):
+        """Bring the table in line with a complete catalog, writing only the rows that differ"""
+        from api_explorer.core.catalog.manager import CatalogManager
+        
+        now = frappe.utils.now()
+        hash_index = CatalogTable.COLUMNS.index('content_hash')
+        rows = {}
+        for app, categories in apps.items():
+            for category, apis in categories.items():
+                for api in apis:
+                    row = CatalogTable.make_row(app, category, api, now)
+                    rows[row[0]] = row
+        
+        existing = dict(frappe.db.sql(f"select name, content_hash from `tab{CatalogTable.DOCTYPE}`"))
+        outdated = [name for name, content_hash in existing.items() if name not in rows or rows[name][hash_index] != content_hash]
+        changed = [row for name, row in rows.items() if existing.get(name) != row[hash_index]]
+        
+        for start in range(0, len(outdated), CatalogTable.DELETE_CHUNK_SIZE):
+            frappe.db.delete(CatalogTable.DOCTYPE, {'name': ('in', outdated[start:start + CatalogTable.DELETE_CHUNK_SIZE])})
+        if changed:
+            frappe.db.bulk_insert(CatalogTable.DOCTYPE, CatalogTable.COLUMNS, changed)
+        frappe.db.commit()
+        
+        frappe.cache().set_value(cache_key(CatalogTable.STATE_KEY), CatalogManager.get_settings_fingerprint(settings),
+            expires_in_sec=CatalogManager.get_ttls(settings)[1])
+        return {'rows': len(rows), 'written': len(changed), 'deleted': len(set(outdated) - set(rows))}
+    
+    @staticmethod
+    def clear():
+        frappe.cache().delete_value(cache_key(CatalogTable.STATE_KEY))
+        frappe.db.delete(CatalogTable.DOCTYPE)
+        frappe.db.commit()
+    
+    @staticmethod
+    def encode_cursor(values):
+        return base64.urlsafe_b64encode(json.dumps(values, separators=(',', ':')).encode()).decode()
+    
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except Exception:
+            values = None
+        
+        if not isinstance(values, list) or len(values) != 2:
+            frappe.throw("Invalid pagination cursor")
+        return values
+    
+    @staticmethod
+    def get_page(app, category, page_size, page=1, cursor=None, search_query="", sort_by='name', sort_order='asc'):
+        """One page of APIs from the (app, category, sort column, name) index; a cursor makes deep pages cost the same as the first"""
+        column = CatalogTable.SORT_COLUMNS.get(sort_by, 'api_name')
+        direction = 'desc' if str(sort_order).lower() == 'desc' else 'asc'
+        conditions = ["app = %(app)s", "category = %(category)s"]
+        values = {'app': app, 'category': category}
+        
+        if search_query:
+            escaped = search_query.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            conditions.append("(lower(api_name) like %(search)s or lower(api_path) like %(search)s)")
+            values['search'] = f"%{escaped}%"
+        
+        table = f"`tab{CatalogTable.DOCTYPE}`"
+        total_items = frappe.db.sql(f"select count(*) from {table} where {' and '.join(conditions)}", values)[0][0]
+        
+        offset = 0
+        if cursor:
+            values['last_value'], values['last_name'] = CatalogTable.decode_cursor(cursor)
+            operator = '<' if direction == 'desc' else '>'
+            conditions.append(f"({column} {operator} %(last_value)s or ({column} = %(last_value)s and name {operator} %(last_name)s))")
+        else:
+            offset = (max(1, cint(page)) - 1) * page_size
+        
+        # One extra row tells whether another page follows
+        rows = frappe.db.sql(
+            f"""select name, {column} as sort_value, payload from {table}
+            where {' and '.join(conditions)}
+            order by {column} {direction}, name {direction}
+            limit %(limit)s offset %(offset)s""",
+            dict(values, limit=page_size + 1, offset=offset),
+            as_dict=True
+        )
+        
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        
+        return {
+            'apis': [json.loads(row.payload) for row in rows],
+            'total_items': total_items,
+            'next_cursor': CatalogTable.encode_cursor([rows[-1].sort_value, rows[-1].name]) if has_next else None,
+            'has_next': has_next
+        }
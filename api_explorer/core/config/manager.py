@@ -1,10 +1,29 @@
 import frappe
+import time
+from api_explorer.core.cache.manager import cache_key, get_generation
+
+# Per-site settings snapshot in this process: site -> (cache generation, expires at, settings)
+_snapshots = {}
+SNAPSHOT_TTL = 600
 
 class ConfigManager:
     @staticmethod
     def get_settings():
-        # Ultra-fast cache
-        cached = frappe.cache().get_value('api_explorer_settings')
+        """Settings from this process's snapshot while the cache generation is unchanged; the dict is shared and must not be modified"""
+        site = getattr(frappe.local, 'site', None)
+        generation = get_generation()
+        snapshot = _snapshots.get(site)
+        if snapshot and snapshot[0] == generation and snapshot[1] > time.monotonic():
+            return snapshot[2]
+        
+        settings = ConfigManager._load_settings()
+        _snapshots[site] = (generation, time.monotonic() + SNAPSHOT_TTL, settings)
+        return settings
+    
+    @staticmethod
+    def _load_settings():
+        # Shared redis copy, so only the first worker after a change reads the database
+        cached = frappe.cache().get_value(cache_key('api_explorer_settings'))
         if cached:
             return cached
         
@@ -23,7 +42,7 @@ class ConfigManager:
             result = ConfigManager.get_default_settings()
         
         # Cache for 10 minutes
-        frappe.cache().set_value('api_explorer_settings', result, expires_in_sec=600)
+        frappe.cache().set_value(cache_key('api_explorer_settings'), result, expires_in_sec=600)
         return result
     
     @staticmethod
@@ -48,6 +67,13 @@ class ConfigManager:
             'include_tokens_in_code': 1,
             'show_formatted_response': 0,
             'max_apis_per_app': 1000,
+            'discovery_engine': 'AST',
+            'scan_workers': 0,
+            'scan_time_budget': 20,
+            'catalog_soft_ttl': 300,
+            'catalog_hard_ttl': 86400,
+            'catalog_storage': 'Cache',
+            'large_table_threshold': 1000000,
             'allowed_user_roles': [{'role': 'Administrator'}],
             'excluded_apps': [],
             'excluded_api_methods': []
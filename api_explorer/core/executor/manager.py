@@ -1,6 +1,7 @@
 import frappe
 import json
 import time
+from frappe.utils import cint
 from api_explorer.core.auth.manager import AuthManager
 from api_explorer.core.config.manager import ConfigManager
 
@@ -20,7 +21,8 @@ class APIExecutor:
             "session_id": user_context["session_id"],
             "start_time": start_time,
             "parameters": parameters or {},
-            "files": files or {}
+            "files": files or {},
+            "warnings": []
         }
         
         try:
@@ -39,6 +41,8 @@ class APIExecutor:
                 "timestamp": frappe.utils.now(),
                 "formatted_response_on_copy": self.settings.get('show_formatted_response', 0)
             }
+            if execution_context["warnings"]:
+                response_data["warnings"] = execution_context["warnings"]
             
             # Log if enabled - always call, manager checks setting
             self._log_api_call(response_data, execution_context)
@@ -61,6 +65,7 @@ class APIExecutor:
         if "::" in api_path:
             method, doctype = api_path.split("::", 1)
             if method == "frappe.client.get_list":
+                context["warnings"].extend(self._check_list_cost(doctype, parameters))
                 return frappe.client.get_list(doctype, **parameters)
             elif method == "frappe.client.get":
                 return frappe.client.get(doctype, **parameters)
@@ -105,6 +110,44 @@ class APIExecutor:
         
         return result
     
+    def _check_list_cost(self, doctype, parameters):
+        """Refuse unbounded lists of large tables and warn when no indexed field is filtered on"""
+        from api_explorer.core.scanner.table_stats import get_large_table_threshold, get_table_stats
+        
+        threshold = get_large_table_threshold(self.settings)
+        stats = get_table_stats().get(doctype) if threshold else None
+        if not stats or (stats.get('estimated_rows') or 0) < threshold:
+            return []
+        
+        rows = stats['estimated_rows']
+        # frappe.client.get_list pages 20 rows unless told otherwise; 0 or None means no limit
+        limit = parameters.get('limit', parameters.get('limit_page_length', 20))
+        if cint(limit) <= 0:
+            frappe.throw(f"{doctype} has about {rows:,} rows. Pass a positive limit_page_length to list it.", frappe.ValidationError)
+        
+        indexed = {columns[0] for columns in stats.get('indexes', []) if columns}
+        if not indexed.intersection(self._filter_fields(parameters.get('filters'))):
+            return [f"{doctype} has about {rows:,} rows and no indexed field is filtered on, so this query may scan the whole table."]
+        return []
+    
+    @staticmethod
+    def _filter_fields(filters):
+        if isinstance(filters, str):
+            try:
+                filters = json.loads(filters)
+            except ValueError:
+                return set()
+        
+        if isinstance(filters, dict):
+            return set(filters)
+        
+        fields = set()
+        for condition in filters or []:
+            # [field, operator, value] or [doctype, field, operator, value]
+            if isinstance(condition, (list, tuple)) and len(condition) >= 3:
+                fields.add(condition[1] if len(condition) >= 4 else condition[0])
+        return fields
+    
     def _handle_execution_error(self, error, context, start_time):
         response_time = (time.time() - start_time) * 1000
         error_message = str(error)
@@ -232,7 +275,7 @@ def execute_api():
                     files[key] = file_obj
         
         executor = APIExecutor()
-        return executor.execute_api(api_path, parameters, files)
+        return executor.execute_api(api_path, parameters, files, user_context)
     except Exception as e:
         return {
             "status_code": 500,
@@ -270,7 +313,7 @@ def handle_file_upload():
             files = dict(frappe.request.files)
         
         executor = APIExecutor()
-        result = executor.execute_api(api_path, form_data, files)
+        result = executor.execute_api(api_path, form_data, files, user_context)
         
         return {
             "success": result["success"],
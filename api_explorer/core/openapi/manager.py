@@ -1,129 +1,339 @@
 import frappe
+import hashlib
+import json
+import os
+from itertools import chain
+from frappe.utils import cint
+from api_explorer.core.cache.http import is_not_modified, make_etag
+from api_explorer.core.cache.manager import TieredCache
+from api_explorer.core.catalog import codec
 try:
     import yaml
     YAML_AVAILABLE = True
+    
+    class _SpecDumper(yaml.SafeDumper):
+        # Request bodies share one schema object per operation; write it out instead of as YAML anchors
+        def ignore_aliases(self, data):
+            return True
 except ImportError:
     YAML_AVAILABLE = False
 
+# Assembled spec documents, one per app (or site) and format; compressed in redis
+_specs = TieredCache('openapi', ttl=3600, max_bytes=16 * 1024 * 1024, codec=codec)
+
+# Serialized `paths` entries of one app, versioned by the hashes of that app's APIs
+_fragments = TieredCache('openapi_fragments', ttl=3600, max_bytes=32 * 1024 * 1024, codec=codec)
+
+# Streamed specs are flushed to the client in chunks of about this size
+STREAM_CHUNK_BYTES = 64 * 1024
+
+# Every operation answers with the same responses, so they are defined once and referenced
+OPERATION_RESPONSES = {
+    "200": {"$ref": "#/components/responses/Success"},
+    "400": {"$ref": "#/components/responses/BadRequest"},
+    "401": {"$ref": "#/components/responses/Unauthorized"},
+    "403": {"$ref": "#/components/responses/Forbidden"},
+    "500": {"$ref": "#/components/responses/ServerError"}
+}
+
+SPEC_COMPONENTS = {
+    "securitySchemes": {
+        "ApiKeyAuth": {"type": "apiKey", "in": "header", "name": "Authorization", "description": "Format: 'token <api_key>:<api_secret>'"}
+    },
+    "schemas": {
+        "SuccessResponse": {
+            "type": "object",
+            "properties": {"message": {"description": "Response data"}}
+        },
+        "ErrorResponse": {
+            "type": "object",
+            "properties": {
+                "exc_type": {"type": "string"},
+                "exception": {"type": "string"},
+                "_server_messages": {"type": "string"}
+            }
+        }
+    },
+    "responses": {
+        "Success": {
+            "description": "Successful response",
+            "content": {"application/json": {"schema": {"$ref": "#/components/schemas/SuccessResponse"}}}
+        },
+        "BadRequest": {
+            "description": "Bad Request",
+            "content": {"application/json": {"schema": {"$ref": "#/components/schemas/ErrorResponse"}}}
+        },
+        "Unauthorized": {"description": "Unauthorized - Invalid or missing authentication"},
+        "Forbidden": {"description": "Forbidden - Insufficient permissions"},
+        "ServerError": {
+            "description": "Internal Server Error",
+            "content": {"application/json": {"schema": {"$ref": "#/components/schemas/ErrorResponse"}}}
+        }
+    }
+}
+
 @frappe.whitelist(xss_safe=False)
 def get_openapi_spec():
     try:
         app_name = frappe.form_dict.get('app')
         format_type = frappe.form_dict.get('format', 'json')
         
+        from api_explorer.core.auth.manager import AuthManager
+        from api_explorer.core.catalog.manager import CatalogManager
         from api_explorer.core.scanner.manager import APIScanner
         scanner = APIScanner()
-        api_data = scanner.scan_all_apis()
+        user_context = AuthManager.get_current_user_context()
+        spec_format = 'yaml' if format_type == 'yaml' and YAML_AVAILABLE else 'json'
         
-        spec = {
-            "openapi": "3.0.3",
-            "info": {
-                "title": f"{app_name} APIs" if app_name else "Frappe APIs",
-                "description": "API documentation generated by API Explorer",
-                "version": "1.0.0",
-                "contact": {"name": "API Support", "url": frappe.utils.get_url()}
-            },
-            "servers": [{"url": frappe.utils.get_url(), "description": "Current Site"}],
-            "paths": {},
-            "components": {
-                "securitySchemes": {
-                    "ApiKeyAuth": {"type": "apiKey", "in": "header", "name": "Authorization", "description": "Format: 'token <api_key>:<api_secret>'"}
-                },
-                "schemas": {
-                    "SuccessResponse": {
-                        "type": "object",
-                        "properties": {"message": {"description": "Response data"}}
-                    },
-                    "ErrorResponse": {
-                        "type": "object",
-                        "properties": {
-                            "exc_type": {"type": "string"},
-                            "exception": {"type": "string"},
-                            "_server_messages": {"type": "string"}
-                        }
-                    }
-                }
-            },
-            "security": [{"ApiKeyAuth": []}]
-        }
+        # Only users who may see the catalog are served from the shared cache
+        allowed = user_context.get("authenticated") and user_context.get("permissions", {}).get("api_explorer_access")
+        version = CatalogManager.get_version(scanner.settings) if allowed else None
         
-        apps = api_data.get("apps", {})
-        if app_name and app_name in apps:
-            apps = {app_name: apps[app_name]}
+        etag = make_etag(version, app_name or '', spec_format) if version else None
+        if etag and is_not_modified(etag):
+            return None
         
-        for app, categories in apps.items():
-            for category, apis in categories.items():
-                if isinstance(apis, list):
-                    for api in apis:
-                        api_path = api.get('path', '')
-                        path = f"/api/method/{api_path}"
-                        if path not in spec["paths"]:
-                            spec["paths"][path] = {}
-                        
-                        # Build request body from parameters
-                        request_body = {"type": "object", "properties": {}}
-                        required_params = []
-                        
-                        for param in api.get('parameters', []):
-                            param_name = param.get('name') if isinstance(param, dict) else param
-                            param_type = param.get('type', 'string') if isinstance(param, dict) else 'string'
-                            param_desc = param.get('description', '') if isinstance(param, dict) else ''
-                            is_required = param.get('required', False) if isinstance(param, dict) else False
-                            
-                            request_body["properties"][param_name] = {
-                                "type": param_type,
-                                "description": param_desc or f"Parameter {param_name}"
-                            }
-                            if is_required:
-                                required_params.append(param_name)
-                        
-                        if required_params:
-                            request_body["required"] = required_params
-                        
-                        operation = {
-                            "operationId": api_path.replace('.', '_'),
-                            "summary": api.get("name", "API Endpoint"),
-                            "description": api.get('docstring', f"API from {app} - {category}"),
-                            "tags": [f"{app}-{category}"],
-                            "responses": {
-                                "200": {
-                                    "description": "Successful response",
-                                    "content": {"application/json": {"schema": {"$ref": "#/components/schemas/SuccessResponse"}}}
-                                },
-                                "400": {
-                                    "description": "Bad Request",
-                                    "content": {"application/json": {"schema": {"$ref": "#/components/schemas/ErrorResponse"}}}
-                                },
-                                "401": {"description": "Unauthorized - Invalid or missing authentication"},
-                                "403": {"description": "Forbidden - Insufficient permissions"},
-                                "500": {
-                                    "description": "Internal Server Error",
-                                    "content": {"application/json": {"schema": {"$ref": "#/components/schemas/ErrorResponse"}}}
-                                }
-                            }
-                        }
-                        
-                        # Add request body if parameters exist
-                        if request_body["properties"]:
-                            operation["requestBody"] = {
-                                "required": bool(required_params),
-                                "content": {
-                                    "application/json": {"schema": request_body},
-                                    "application/x-www-form-urlencoded": {"schema": request_body}
-                                }
-                            }
-                        
-                        spec["paths"][path]["post"] = operation
+        cache_key = f"{app_name or ''}::{spec_format}"
+        body = _specs.get(cache_key, version) if version else None
+        if body is None and cint(frappe.form_dict.get('stream')):
+            # Written path by path from the catalog records as it is sent instead of assembled first; not cached
+            apps, built_version = scanner.get_catalog_apps(user_context)
+            chunks = stream_openapi_spec(app_name, apps, spec_format)
+            return make_spec_response(chunks, spec_format, etag if built_version == version else None)
         
-        if format_type == 'yaml' and YAML_AVAILABLE:
-            frappe.local.response.headers['Content-Type'] = 'application/x-yaml'
-            return yaml.dump(spec, default_flow_style=False, sort_keys=False)
+        if body is None:
+            body, built_version = render_openapi_spec(scanner, app_name, spec_format, user_context, version)
+            if version and built_version == version:
+                _specs.set(cache_key, body, version)
         
-        return spec
+        return make_spec_response(body, spec_format, etag)
     except Exception as e:
         frappe.log_error(f"OpenAPI Error: {str(e)}")
         return {"error": "Failed to generate OpenAPI spec", "message": str(e)}
 
+def make_spec_response(body, spec_format, etag=None):
+    """Send an assembled document, or an iterator of its chunks, as is; JSON keeps the `{"message": ...}` envelope"""
+    from werkzeug.wrappers import Response
+    
+    if not isinstance(body, str):
+        if spec_format == 'json':
+            body = chain(['{"message":'], body, ['}'])
+        content_type = 'application/x-yaml; charset=utf-8' if spec_format == 'yaml' else 'application/json'
+        # A passed-through body reaches the server as is, so the chunks are encoded here
+        response = Response((chunk.encode('utf-8') for chunk in body), content_type=content_type, direct_passthrough=True)
+    elif spec_format == 'yaml':
+        response = Response(body, content_type='application/x-yaml; charset=utf-8')
+    else:
+        response = Response('{"message":' + body + '}', content_type='application/json')
+    
+    if etag:
+        response.headers['ETag'] = etag
+        response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def render_openapi_spec(scanner, app_name, spec_format, user_context=None, version=None):
+    """The spec of one app, or of the site, joined from per-app fragments, and the catalog version it reflects"""
+    from api_explorer.core.catalog.manager import CatalogManager
+    
+    manifest = CatalogManager.get_manifest(version) if version else None
+    catalog_apps, built_version = None, version
+    if manifest is None:
+        catalog_apps, built_version = scanner.get_catalog_apps(user_context)
+        apps = list(catalog_apps)
+    else:
+        apps = list(dict.fromkeys(slice_key.split('::', 1)[0] for slice_key in manifest))
+    
+    if app_name:
+        apps = [app for app in apps if app == app_name]
+    
+    # Only apps whose APIs changed since their fragment was cached are serialized again
+    fragments = []
+    for app in apps:
+        fragment_version = get_fragment_version(manifest, app) if manifest else None
+        fragment = _fragments.get(f"{app}::{spec_format}", fragment_version) if fragment_version else None
+        
+        if fragment is None:
+            if catalog_apps is None:
+                catalog_apps, built_version = scanner.get_catalog_apps(user_context)
+            fragment = render_fragment(build_paths(app, catalog_apps.get(app, {})), spec_format)
+            if fragment_version and built_version == version:
+                _fragments.set(f"{app}::{spec_format}", fragment, fragment_version)
+        
+        if fragment:
+            fragments.append(fragment)
+    
+    return assemble_spec(app_name, fragments, spec_format), built_version
+
+def get_fragment_version(manifest, app):
+    """Hash of one app's entries in a catalog manifest; unchanged apps keep their fragments across versions"""
+    prefix = f"{app}::"
+    scoped = sorted((slice_key, sorted(hashes.items())) for slice_key, hashes in manifest.items() if slice_key.startswith(prefix))
+    return hashlib.sha1(json.dumps(scoped).encode()).hexdigest()[:16]
+
+def render_fragment(paths, spec_format):
+    """`paths` entries serialized to be placed inside the document's `paths` object"""
+    if not paths:
+        return ""
+    if spec_format == 'yaml':
+        text = dump_yaml(paths)
+        return ''.join(f"  {line}" for line in text.splitlines(keepends=True))
+    return json.dumps(paths, separators=(',', ':'))[1:-1]
+
+def assemble_spec(app_name, fragments, spec_format):
+    head, tail = get_spec_frame(app_name, spec_format, bool(fragments))
+    return head + (',' if spec_format == 'json' else '').join(fragments) + tail
+
+def get_spec_frame(app_name, spec_format, has_paths=True):
+    """The document text before and after the entries of its `paths` object"""
+    head = get_spec_head(app_name)
+    tail = {"components": SPEC_COMPONENTS, "security": [{"ApiKeyAuth": []}]}
+    
+    if spec_format == 'yaml':
+        return (
+            dump_yaml(head) + ("paths:\n" if has_paths else "paths: {}\n"),
+            dump_yaml(tail)
+        )
+    return json.dumps(head)[:-1] + ',"paths":{', '},' + json.dumps(tail)[1:]
+
+def dump_yaml(data):
+    return yaml.dump(data, Dumper=_SpecDumper, default_flow_style=False, sort_keys=False)
+
+def stream_openapi_spec(app_name, apps, spec_format, chunk_bytes=STREAM_CHUNK_BYTES):
+    """Chunks of the spec document, serialized one operation at a time so memory stays flat however many APIs the site has"""
+    if app_name:
+        apps = {app_name: apps[app_name]} if app_name in apps else {}
+    
+    # Built up front: a streamed response is iterated after the request (and frappe.local) is torn down
+    has_paths = any(apis for categories in apps.values() for apis in categories.values() if isinstance(apis, list))
+    head, tail = get_spec_frame(app_name, spec_format, has_paths)
+    return _iter_spec_chunks(head, tail, apps, spec_format, chunk_bytes)
+
+def _iter_spec_chunks(head, tail, apps, spec_format, chunk_bytes):
+    buffer, size = [head], len(head)
+    separator = ''
+    
+    for app, categories in apps.items():
+        # An API listed in several categories is one path; like build_paths, its first position and last category win
+        operations = {}
+        for category, apis in categories.items():
+            if isinstance(apis, list):
+                for api in apis:
+                    operations[f"/api/method/{api.get('path', '')}"] = (category, api)
+        
+        for path, (category, api) in operations.items():
+            item = {"post": build_operation(app, category, api)}
+            if spec_format == 'yaml':
+                text = render_fragment({path: item}, spec_format)
+            else:
+                text = separator + json.dumps(path) + ':' + json.dumps(item, separators=(',', ':'))
+                separator = ','
+            
+            buffer.append(text)
+            size += len(text)
+            if size >= chunk_bytes:
+                yield ''.join(buffer)
+                buffer, size = [], 0
+    
+    buffer.append(tail)
+    yield ''.join(buffer)
+
+# Run with: bench --site <site> execute api_explorer.core.openapi.manager.export_openapi_spec --kwargs "{'format': 'yaml'}"
+def export_openapi_spec(app=None, format='json'):
+    """Write the spec to the site's private files, streamed path by path"""
+    from api_explorer.core.scanner.manager import APIScanner
+    
+    spec_format = 'yaml' if format == 'yaml' and YAML_AVAILABLE else 'json'
+    apps, version = APIScanner().get_catalog_apps()
+    
+    file_path = frappe.get_site_path('private', 'files', f"openapi-{app or 'site'}.{spec_format}")
+    written = 0
+    with open(file_path + '.tmp', 'w', encoding='utf-8') as f:
+        for chunk in stream_openapi_spec(app, apps, spec_format):
+            f.write(chunk)
+            written += len(chunk)
+    # Readers never see a half-written spec
+    os.replace(file_path + '.tmp', file_path)
+    
+    return {"file_path": file_path, "catalog_version": version, "characters": written}
+
+def get_spec_head(app_name):
+    return {
+        "openapi": "3.0.3",
+        "info": {
+            "title": f"{app_name} APIs" if app_name else "Frappe APIs",
+            "description": "API documentation generated by API Explorer",
+            "version": "1.0.0",
+            "contact": {"name": "API Support", "url": frappe.utils.get_url()}
+        },
+        "servers": [{"url": frappe.utils.get_url(), "description": "Current Site"}]
+    }
+
+def build_openapi_spec(app_name, apps):
+    """The spec as a dict, for callers that post-process it"""
+    if app_name and app_name in apps:
+        apps = {app_name: apps[app_name]}
+    
+    paths = {}
+    for app, categories in apps.items():
+        paths.update(build_paths(app, categories))
+    
+    return dict(get_spec_head(app_name), paths=paths, components=SPEC_COMPONENTS, security=[{"ApiKeyAuth": []}])
+
+def build_paths(app, categories):
+    paths = {}
+    for category, apis in categories.items():
+        if not isinstance(apis, list):
+            continue
+        
+        for api in apis:
+            api_path = api.get('path', '')
+            paths.setdefault(f"/api/method/{api_path}", {})["post"] = build_operation(app, category, api)
+    
+    return paths
+
+def build_operation(app, category, api):
+    api_path = api.get('path', '')
+    
+    # Build request body from parameters
+    request_body = {"type": "object", "properties": {}}
+    required_params = []
+    
+    for param in api.get('parameters', []):
+        param_name = param.get('name') if isinstance(param, dict) else param
+        param_type = param.get('type', 'string') if isinstance(param, dict) else 'string'
+        param_desc = param.get('description', '') if isinstance(param, dict) else ''
+        is_required = param.get('required', False) if isinstance(param, dict) else False
+        
+        request_body["properties"][param_name] = {
+            "type": param_type,
+            "description": param_desc or f"Parameter {param_name}"
+        }
+        if is_required:
+            required_params.append(param_name)
+    
+    if required_params:
+        request_body["required"] = required_params
+    
+    operation = {
+        "operationId": api_path.replace('.', '_'),
+        "summary": api.get("name", "API Endpoint"),
+        "description": api.get('docstring') or f"API from {app} - {category}",
+        "tags": [f"{app}-{category}"],
+        "responses": OPERATION_RESPONSES
+    }
+    
+    # Add request body if parameters exist
+    if request_body["properties"]:
+        operation["requestBody"] = {
+            "required": bool(required_params),
+            "content": {
+                "application/json": {"schema": request_body},
+                "application/x-www-form-urlencoded": {"schema": request_body}
+            }
+        }
+    
+    return operation
+
 @frappe.whitelist(xss_safe=False)
 def get_api_schema():
     try:
@@ -131,36 +341,35 @@ def get_api_schema():
         if not api_path:
             return {"error": "API path is required"}
         
-        # Try to get actual function details
+        # Described from the catalog and the function's source, without importing its module
         try:
-            func = frappe.get_attr(api_path)
-            import inspect
+            from api_explorer.core.scanner.details import get_api_details
+            from api_explorer.core.scanner.manager import APIScanner
+            
+            details = get_api_details(APIScanner(), api_path)
+            if not details:
+                raise ValueError(f"API not found: {api_path}")
             
-            # Get docstring
-            docstring = inspect.getdoc(func) or f"API endpoint: {api_path}"
+            docstring = details.get('docstring') or f"API endpoint: {api_path}"
             
             # Get parameters for OpenAPI format
             request_body = {"type": "object", "properties": {}}
             
-            try:
-                sig = inspect.signature(func)
-                for param_name, param in sig.parameters.items():
-                    if param_name not in ['self', 'cls']:
-                        param_schema = {
-                            "type": "string",
-                            "description": f"Parameter {param_name}"
-                        }
-                        if param.default != inspect.Parameter.empty:
-                            param_schema["default"] = str(param.default)
-                        
-                        request_body["properties"][param_name] = param_schema
-                        
-                        if param.default == inspect.Parameter.empty:
-                            if "required" not in request_body:
-                                request_body["required"] = []
-                            request_body["required"].append(param_name)
-            except:
-                pass
+            for param in details.get('parameters', []):
+                if param.get('kind') in ('var_positional', 'var_keyword'):
+                    continue
+                
+                param_schema = {
+                    "type": param.get('type', 'string'),
+                    "description": f"Parameter {param['name']}"
+                }
+                if param.get('default_value'):
+                    param_schema["default"] = param['default_value']
+                
+                request_body["properties"][param['name']] = param_schema
+                
+                if param.get('required'):
+                    request_body.setdefault("required", []).append(param['name'])
             
             return {
                 "openapi": "3.0.3",
@@ -234,7 +443,7 @@ def get_api_schema():
                     }
                 }
             }
-            
+        
         except Exception as func_error:
             return {
                 "openapi": "3.0.3",
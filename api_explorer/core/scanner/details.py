@@ -0,0 +1,118 @@
+import ast
+from api_explorer.core.cache.manager import TieredCache
+from api_explorer.core.scanner.file_scanner import FileScanner
+from api_explorer.core.scanner.records import APIRecord
+
+# Detail views are shared by all users and versioned by the catalog the API was listed in
+_details = TieredCache('api_details', ttl=3600, max_bytes=8 * 1024 * 1024)
+
+# Categories whose APIs are functions in source files; resource and scheduler entries carry their own details
+SOURCE_CATEGORIES = ('public', 'internal')
+
+def get_api_details(scanner, api_path, user_context=None):
+    """Docstring, full signature and source location of one listed API, parsed from its source file rather than imported"""
+    from api_explorer.core.catalog.manager import CatalogManager
+    from api_explorer.core.scanner.manager import enqueue_catalog_rebuild
+    
+    app = api_path.split('.', 1)[0]
+    version = CatalogManager.get_version(scanner.settings)
+    
+    details = _details.get(api_path, version) if version else None
+    if details:
+        return details if scanner.is_listed(app, details['category'], user_context) else None
+    
+    # Only the catalog is read; scanning here would parse or, with the registry engine, import the app in a request
+    building = False
+    for category in SOURCE_CATEGORIES:
+        if not scanner.is_listed(app, category, user_context):
+            continue
+        apis = CatalogManager.get_app_category(scanner.settings, app, category)
+        if apis is None:
+            building = True
+            continue
+        record = next((api for api in apis if api.get('path') == api_path), None)
+        if record is not None:
+            break
+    else:
+        if building:
+            enqueue_catalog_rebuild()
+            return {"catalog_building": True}
+        return None
+    
+    details = dict(read_details(record) if isinstance(record, APIRecord) else record, category=category)
+    if version:
+        _details.set(api_path, details, version)
+    return details
+
+def read_details(record):
+    """Describe a discovered function from the AST of its source file"""
+    details = {
+        "name": record.name,
+        "path": record.path,
+        "location": record.path,
+        "docstring": record.docstring,
+        "parameters": [param.as_dict() for param in record.parameters],
+        "returns": None,
+        "decorators": [],
+        "file_path": record.file_path,
+        "line_number": record.line_number,
+        "end_line_number": None,
+        "is_whitelisted": record.is_whitelisted,
+        "allow_guest": record.allow_guest
+    }
+    
+    node = find_function(record.file_path, record.name, record.line_number)
+    if node is None:
+        return details  # Source moved or unreadable since the scan; keep what the catalog knows
+    
+    details.update({
+        "docstring": ast.get_docstring(node) or "",
+        "parameters": describe_parameters(node),
+        "returns": ast.unparse(node.returns) if node.returns else None,
+        "decorators": [ast.unparse(decorator) for decorator in node.decorator_list],
+        "line_number": node.lineno,
+        "end_line_number": getattr(node, 'end_lineno', None)
+    })
+    return details
+
+def find_function(file_path, name, line_number):
+    try:
+        with open(file_path, encoding='utf-8') as f:
+            tree = ast.parse(f.read())
+    except Exception:
+        return None
+    
+    candidates = [node for node in ast.walk(tree) if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == name]
+    for node in candidates:
+        # The file scanner records the `def` line; the registry scanner records the first decorator line
+        first_line = node.decorator_list[0].lineno if node.decorator_list else node.lineno
+        if line_number in (node.lineno, first_line):
+            return node
+    return candidates[0] if candidates else None
+
+def describe_parameters(node):
+    args = node.args
+    positional = args.posonlyargs + args.args
+    defaults = [None] * (len(positional) - len(args.defaults)) + args.defaults
+    
+    entries = [(arg, default, 'positional') for arg, default in zip(positional, defaults)]
+    if args.vararg:
+        entries.append((args.vararg, None, 'var_positional'))
+    entries.extend((arg, default, 'keyword_only') for arg, default in zip(args.kwonlyargs, args.kw_defaults))
+    if args.kwarg:
+        entries.append((args.kwarg, None, 'var_keyword'))
+    
+    params = []
+    for arg, default, kind in entries:
+        if arg.arg in ('self', 'cls'):
+            continue
+        params.append({
+            "name": arg.arg,
+            "type": FileScanner._get_param_type(arg),
+            "required": default is None and kind in ('positional', 'keyword_only'),
+            "description": "",
+            "default_value": ast.unparse(default) if default is not None else "",
+            "annotation": ast.unparse(arg.annotation) if arg.annotation else None,
+            "kind": kind
+        })
+    return params
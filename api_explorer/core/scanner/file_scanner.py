@@ -2,19 +2,43 @@ import frappe
 import os
 import ast
 import inspect
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from functools import lru_cache
+from frappe.utils import cint
+from api_explorer.core.scanner.filters import get_method_filter
+from api_explorer.core.scanner.index import ScanIndex
+from api_explorer.core.scanner.records import APIRecord, summarize_docstring
+
+# Below this many changed files in a batch the pool round trip costs more than it saves
+PARALLEL_SCAN_THRESHOLD = 32
+# Files looked up and parsed together before the time budget is checked again
+SCAN_BATCH_SIZE = 256
+
+@lru_cache(maxsize=128)
+def _get_app_path(app):
+    # Module level so the cache doesn't keep scanner instances (and their settings) alive
+    return frappe.get_app_path(app)
+
+def _parse_source(args):
+    """Process pool entry point; parsing is pure CPU and needs no frappe context"""
+    return FileScanner._extract_functions_fast(*args)
 
 class FileScanner:
-    def __init__(self, settings):
+    def __init__(self, settings, parallel=False):
         self.settings = settings
+        # Only background rebuilds fan out over processes; a web worker must never fork mid-request
+        self.parallel = parallel
+        self.scan_workers = 1
         self.excluded_dirs = ['__pycache__', '.git', 'node_modules', 'public', 'templates', 'migrations']
         self.excluded_prefixes = ['test_', '_test', '__']
         self._load_filtering_settings()
         self._function_cache = {}
+        self.incomplete_apps = set()
     
-    @lru_cache(maxsize=128)
     def get_app_path(self, app):
-        return frappe.get_app_path(app)
+        return _get_app_path(app)
     
     def get_public_apis(self, app, max_apis):
         return self._get_categorized_functions(app, max_apis, 'public')
@@ -27,69 +51,175 @@ class FileScanner:
     
     def _get_categorized_functions(self, app, max_apis, category):
         if app not in self._function_cache:
-            self._function_cache[app] = self._scan_all_functions(app)
+            self.prefetch([app])
         
-        functions = self._function_cache[app].get(category, [])
+        functions = self._function_cache.get(app, {}).get(category, [])
         return functions[:max_apis]
     
-    def _scan_all_functions(self, app):
-        public_apis = []
-        internal_apis = []
-        resource_apis = []
+    def prefetch(self, apps):
+        """Scan several apps in one pipeline sharing one worker pool; apps the time budget cuts short go to `incomplete_apps`"""
+        pending = [app for app in apps if app not in self._function_cache]
+        if not pending:
+            return
+        
         max_apis_limit = self.settings.get('max_apis_per_app', 1000)
+        results = {app: {'public': [], 'internal': [], 'resource': []} for app in pending}
         
         try:
-            app_path = self.get_app_path(app)
-            file_count = 0
-            max_files = 200  # Limit files to prevent timeout
+            for app, category, func_info in self.iter_apis(pending):
+                bucket = results[app][category]
+                if len(bucket) < max_apis_limit:
+                    bucket.append(func_info)
+        except Exception as e:
+            frappe.log_error(f"Error scanning {', '.join(pending)}: {str(e)}")
+        
+        self._function_cache.update(results)
+    
+    def iter_apis(self, apps):
+        """Stream (app, category, func_info) for every allowed function: walk, filter, parse, categorize"""
+        for app, functions in self._iter_parsed(list(apps)):
+            for func_info in functions:
+                category = self._categorize(func_info)
+                if category:
+                    yield app, category, func_info
+    
+    def _iter_files(self, apps):
+        """Walk and filter stage: yield (app, app_path, file_path) in a stable order"""
+        for app in apps:
+            try:
+                app_path = self.get_app_path(app)
+            except Exception as e:
+                frappe.log_error(f"Error scanning {app}: {str(e)}")
+                continue
             
-            # Fast file traversal with limits
             for root, dirs, files in os.walk(app_path):
-                dirs[:] = [d for d in dirs if d not in self.excluded_dirs]
+                dirs[:] = sorted(d for d in dirs if d not in self.excluded_dirs)
                 
-                for file in files:
-                    if file_count >= max_files:
-                        break
-                        
+                for file in sorted(files):
                     if file.endswith('.py') and not any(file.startswith(p) for p in self.excluded_prefixes):
-                        file_path = os.path.join(root, file)
-                        file_functions = self._extract_functions_fast(file_path, app)
-                        
-                        for func_info in file_functions:
-                            if not self.is_method_allowed(func_info['path']):
-                                continue
-                                
-                            # Categorize based on whitelist status
-                            if func_info['is_whitelisted']:
-                                if func_info['allow_guest']:
-                                    public_apis.append(func_info)
-                                else:
-                                    internal_apis.append(func_info)
-                            else:
-                                # Limit resource APIs to prevent overload
-                                if len(resource_apis) < 100:
-                                    resource_apis.append(func_info)
-                        
-                        file_count += 1
+                        yield app, app_path, os.path.join(root, file)
+    
+    def _iter_parsed(self, apps):
+        """Parse stage: yield (app, functions) per file, parsing changed files in batches"""
+        budget = cint(self.settings.get('scan_time_budget', 0))
+        deadline = time.monotonic() + budget if budget > 0 else None
+        indexes = {}
+        stopped_at = None
+        self.incomplete_apps = set()
+        
+        with self._get_pool() as pool:
+            batch = []
+            for app, app_path, file_path in self._iter_files(apps):
+                if app not in indexes:
+                    indexes[app] = ScanIndex(app, app_path)
+                batch.append((indexes[app], app, app_path, file_path))
                 
-                if file_count >= max_files:
-                    break
+                if len(batch) >= SCAN_BATCH_SIZE:
+                    yield from self._parse_batch(batch, pool)
+                    batch = []
+                    
+                    if deadline and time.monotonic() > deadline:
+                        stopped_at = app
+                        break
+            
+            yield from self._parse_batch(batch, pool)
         
-        except Exception as e:
-            frappe.log_error(f"Error scanning {app}: {str(e)}")
+        if stopped_at:
+            # The app in progress and everything after it resume on the next scan
+            self.incomplete_apps = set(apps[apps.index(stopped_at):])
         
-        return {
-            'public': public_apis[:max_apis_limit],
-            'internal': internal_apis[:max_apis_limit], 
-            'resource': resource_apis[:max_apis_limit]
-        }
+        for app, index in indexes.items():
+            # Progress is persisted either way; only prune deleted files after a complete walk
+            index.save(prune=app not in self.incomplete_apps)
     
-    def _extract_functions_fast(self, file_path, app):
-        functions = []
+    def _get_pool(self):
+        workers = min(cint(self.settings.get('scan_workers', 0)), os.cpu_count() or 1) if self.parallel else 1
+        self.scan_workers = 1
+        if workers > 1:
+            try:
+                pool = ProcessPoolExecutor(max_workers=workers)
+                self.scan_workers = workers
+                return pool
+            except Exception as e:
+                frappe.log_error(f"Parallel scan unavailable, scanning serially: {str(e)}", "API Explorer")
+        return nullcontext()
+    
+    def _parse_batch(self, batch, pool):
+        results = []
+        misses = []
+        for index, app, app_path, file_path in batch:
+            entry = {'app': app, 'functions': []}
+            results.append(entry)
+            self._lookup_file(index, file_path, app, app_path, entry, misses)
+        
+        self._parse_misses(misses, pool)
+        
+        for entry in results:
+            yield entry['app'], entry['functions']
+    
+    def _lookup_file(self, index, file_path, app, app_path, entry, misses):
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return
+        
+        functions = index.lookup(file_path, stat)
+        if functions is not None:
+            entry['functions'] = functions
+            return
+        
         try:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 content = f.read()
-            
+        except OSError:
+            return
+        
+        content_hash = ScanIndex.hash_content(content)
+        functions = index.lookup_hash(file_path, stat, content_hash)
+        if functions is not None:
+            entry['functions'] = functions
+            return
+        
+        misses.append({
+            'index': index,
+            'entry': entry,
+            'stat': stat,
+            'hash': content_hash,
+            'args': (content, file_path, app, app_path)
+        })
+    
+    def _parse_misses(self, misses, pool=None):
+        """Parse changed files serially or across the process pool and store them in the index"""
+        parsed = None
+        
+        if isinstance(pool, ProcessPoolExecutor) and len(misses) >= PARALLEL_SCAN_THRESHOLD:
+            try:
+                chunksize = max(1, len(misses) // (self.scan_workers * 4))
+                parsed = list(pool.map(_parse_source, [m['args'] for m in misses], chunksize=chunksize))
+            except Exception as e:
+                frappe.log_error(f"Parallel scan failed, falling back to serial: {str(e)}", "API Explorer")
+                parsed = None
+        
+        if parsed is None:
+            parsed = [_parse_source(m['args']) for m in misses]
+        
+        for miss, functions in zip(misses, parsed):
+            miss['entry']['functions'] = functions
+            miss['index'].store(miss['args'][1], miss['stat'], miss['hash'], functions)
+    
+    def _categorize(self, func_info):
+        if not self.is_method_allowed(func_info.path):
+            return None
+        
+        # Categorize based on whitelist status
+        if func_info.is_whitelisted:
+            return 'public' if func_info.allow_guest else 'internal'
+        return 'resource'
+    
+    @staticmethod
+    def _extract_functions_fast(content, file_path, app, app_path):
+        functions = []
+        try:
             # Skip files without function definitions
             if 'def ' not in content:
                 return functions
@@ -98,12 +228,10 @@ class FileScanner:
             
             for node in ast.walk(tree):
                 if isinstance(node, ast.FunctionDef) and not node.name.startswith('_'):
-                    is_whitelisted, allow_guest = self._check_whitelist_decorator(node)
-                    func_info = self._create_api_info_fast(node, file_path, app)
+                    is_whitelisted, allow_guest = FileScanner._check_whitelist_decorator(node)
+                    func_info = FileScanner._create_api_info_fast(node, file_path, app, app_path, is_whitelisted, allow_guest)
                     
                     if func_info:
-                        func_info['is_whitelisted'] = is_whitelisted
-                        func_info['allow_guest'] = allow_guest
                         functions.append(func_info)
         
         except Exception:
@@ -111,7 +239,8 @@ class FileScanner:
         
         return functions
     
-    def _check_whitelist_decorator(self, node):
+    @staticmethod
+    def _check_whitelist_decorator(node):
         is_whitelisted = False
         allow_guest = False
         
@@ -133,25 +262,28 @@ class FileScanner:
         
         return is_whitelisted, allow_guest
     
-    def _create_api_info_fast(self, node, file_path, app):
+    @staticmethod
+    def _create_api_info_fast(node, file_path, app, app_path, is_whitelisted=False, allow_guest=False):
         try:
-            app_path = self.get_app_path(app)
             rel_path = file_path.replace(app_path, '').replace('\\', '.').replace('/', '.').replace('.py', '').strip('.')
             full_path = f"{app}.{rel_path}.{node.name}"
             
-            return {
-                "name": node.name,
-                "path": full_path,
-                "location": full_path,
-                "docstring": "",  # Skip docstring parsing for speed
-                "parameters": self._analyze_parameters_fast(node),
-                "file_path": file_path,
-                "line_number": node.lineno
-            }
+            # Only the docstring's first line is kept, for search; get_api_details reads the rest
+            return APIRecord(
+                node.name,
+                full_path,
+                FileScanner._analyze_parameters_fast(node),
+                file_path,
+                node.lineno,
+                is_whitelisted,
+                allow_guest,
+                summarize_docstring(ast.get_docstring(node))
+            )
         except Exception:
             return None
     
-    def _analyze_parameters_fast(self, node):
+    @staticmethod
+    def _analyze_parameters_fast(node):
         params = []
         try:
             for i, arg in enumerate(node.args.args):
@@ -162,21 +294,16 @@ class FileScanner:
                 has_default = i >= default_offset
                 
                 # Detect type from annotation
-                param_type = self._get_param_type(arg)
+                param_type = FileScanner._get_param_type(arg)
                 
-                params.append({
-                    "name": arg.arg,
-                    "type": param_type,
-                    "required": not has_default,
-                    "description": "",
-                    "default_value": ""
-                })
+                params.append((arg.arg, param_type, not has_default))
         except Exception:
             pass
         
         return params
     
-    def _get_param_type(self, arg):
+    @staticmethod
+    def _get_param_type(arg):
         """Extract parameter type from type annotation"""
         if not arg.annotation:
             return "string"
@@ -208,24 +335,17 @@ class FileScanner:
                 if row.get("app_name"):
                     self.excluded_apps.add(row.get("app_name"))
             
-            # Get excluded methods
-            self.excluded_methods = set()
-            for row in self.settings.get("excluded_api_methods", []):
-                if row.get("method_path"):
-                    self.excluded_methods.add(row.get("method_path"))
+            # Excluded methods are compiled once per rule set and shared by every scanner
+            self.method_filter = get_method_filter(self.settings)
                     
         except Exception as e:
             frappe.log_error(f"Filter settings load error: {str(e)}", "API Explorer")
             self.excluded_apps = set()
-            self.excluded_methods = set()
+            self.method_filter = get_method_filter({})
     
     def is_app_allowed(self, app):
         # Exclude apps in excluded_apps
         return app not in self.excluded_apps
     
     def is_method_allowed(self, method_path):
-        # Check if method is in excluded list
-        for excluded in self.excluded_methods:
-            if method_path.startswith(excluded):
-                return False
-        return True
\ No newline at end of file
+        return not self.method_filter.is_excluded(method_path)
\ No newline at end of file
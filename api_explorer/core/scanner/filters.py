@@ -0,0 +1,64 @@
+import re
+from fnmatch import translate
+from functools import lru_cache
+
+GLOB_CHARS = ('*', '?', '[')
+
+# Marks a trie node where an exclusion prefix ends
+_END = ''
+
+class MethodFilter:
+    """Excluded API Methods compiled into one matcher"""
+    
+    def __init__(self, rules):
+        self._trie = {}
+        patterns = []
+        
+        for rule in rules:
+            rule = (rule or '').strip().lower()
+            if not rule:
+                continue
+            # Globs match the whole path and share one regex; plain rules are prefixes in a character trie
+            if any(char in rule for char in GLOB_CHARS):
+                patterns.append(translate(rule))
+                continue
+            
+            node = self._trie
+            for char in rule:
+                node = node.setdefault(char, {})
+            node[_END] = True
+        
+        self._pattern = re.compile('|'.join(patterns)) if patterns else None
+        self.rule_count = len(rules)
+    
+    def __bool__(self):
+        return bool(self._trie or self._pattern)
+    
+    def is_excluded(self, path):
+        if not path:
+            return False
+        path = path.lower()
+        
+        node = self._trie
+        for char in path:
+            node = node.get(char)
+            if node is None:
+                break
+            if _END in node:
+                return True
+        
+        return bool(self._pattern and self._pattern.match(path))
+    
+    def filter(self, apis):
+        if not self:
+            return apis
+        return [api for api in apis if not self.is_excluded(api.get('path'))]
+
+@lru_cache(maxsize=16)
+def _compile(rules):
+    return MethodFilter(rules)
+
+def get_method_filter(settings):
+    """Compiled filter for the settings' Excluded API Methods, shared by every scan with the same rules"""
+    rules = tuple(sorted({row.get('method_path') for row in settings.get('excluded_api_methods', []) if row.get('method_path')}))
+    return _compile(rules)
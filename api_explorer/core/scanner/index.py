@@ -0,0 +1,95 @@
+import frappe
+import hashlib
+import os
+
+class ScanIndex:
+    """Per-file index of extracted functions for one app, persisted in redis"""
+    # Bump when the extracted function format changes to invalidate old entries
+    INDEX_VERSION = 3
+    
+    def __init__(self, app, app_path):
+        self.app = app
+        self.app_path = app_path
+        self.cache_key = f"api_explorer_scan_index::{app}"
+        self._entries = None
+        self._dirty = {}
+        self._seen = set()
+    
+    @staticmethod
+    def hash_content(content):
+        return hashlib.sha1(content.encode('utf-8', errors='ignore')).hexdigest()
+    
+    def _rel_path(self, file_path):
+        return os.path.relpath(file_path, self.app_path)
+    
+    def load(self):
+        if self._entries is not None:
+            return self._entries
+        
+        self._entries = {}
+        try:
+            stored = frappe.cache().hgetall(self.cache_key) or {}
+            for key, entry in stored.items():
+                if isinstance(key, bytes):
+                    key = key.decode()
+                if entry and entry.get('v') == self.INDEX_VERSION:
+                    self._entries[key] = entry
+        except Exception as e:
+            frappe.log_error(f"Scan index load error for {self.app}: {str(e)}", "API Explorer")
+        
+        return self._entries
+    
+    def lookup(self, file_path, stat):
+        """Return indexed functions if mtime and size are unchanged, else None"""
+        rel_path = self._rel_path(file_path)
+        self._seen.add(rel_path)
+        entry = self.load().get(rel_path)
+        
+        if entry and entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            return entry['functions']
+        return None
+    
+    def lookup_hash(self, file_path, stat, content_hash):
+        """Return indexed functions if the content is unchanged despite a new mtime"""
+        rel_path = self._rel_path(file_path)
+        entry = self.load().get(rel_path)
+        
+        if entry and entry['hash'] == content_hash:
+            # Content identical (touched or re-checked out), refresh the stat only
+            self.store(file_path, stat, content_hash, entry['functions'])
+            return entry['functions']
+        return None
+    
+    def store(self, file_path, stat, content_hash, functions):
+        rel_path = self._rel_path(file_path)
+        entry = {
+            'v': self.INDEX_VERSION,
+            'mtime': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'hash': content_hash,
+            'functions': functions
+        }
+        self.load()[rel_path] = entry
+        self._dirty[rel_path] = entry
+    
+    def save(self, prune=False):
+        """Persist changed entries; drop entries for deleted files when prune is set"""
+        try:
+            cache = frappe.cache()
+            for rel_path, entry in self._dirty.items():
+                cache.hset(self.cache_key, rel_path, entry)
+            
+            if prune and self._entries is not None:
+                for rel_path in [p for p in self._entries if p not in self._seen]:
+                    cache.hdel(self.cache_key, rel_path)
+                    self._entries.pop(rel_path, None)
+        except Exception as e:
+            frappe.log_error(f"Scan index save error for {self.app}: {str(e)}", "API Explorer")
+        
+        self._dirty = {}
+    
+    def clear(self):
+        frappe.cache().delete_value(self.cache_key)
+        self._entries = None
+        self._dirty = {}
+        self._seen = set()
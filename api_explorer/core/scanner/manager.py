@@ -1,128 +1,373 @@
 import frappe
 from functools import lru_cache
 from api_explorer.core.auth.manager import AuthManager
+from api_explorer.core.cache.http import is_not_modified, make_etag, set_response_header
+from api_explorer.core.cache.manager import TieredCache, get_generation
+from api_explorer.core.catalog.manager import CatalogManager
+from api_explorer.core.catalog.table import CatalogTable
 from api_explorer.core.config.manager import ConfigManager
 from api_explorer.core.scanner.file_scanner import FileScanner
+from api_explorer.core.scanner.filters import get_method_filter
+from api_explorer.core.scanner.records import parse_fields, project
+from api_explorer.core.scanner.registry_scanner import RegistryScanner
 from api_explorer.core.scanner.resource_scanner import ResourceScanner
-from api_explorer.core.scanner.scheduler_scanner import SchedulerScanner
+from api_explorer.core.scanner.scheduler_scanner import SchedulerScanner, get_stats_version, with_job_stats
+
+# Projections of the shared catalog served by scan_apis, one per requested field list
+_projections = TieredCache('catalog_projection', ttl=600, max_bytes=32 * 1024 * 1024, shared=False)
+
+# Catalog category -> (settings flag that enables it, default when unset)
+CATEGORY_SETTINGS = {
+    'public': ('show_public_apis', 1),
+    'internal': ('show_internal_apis', 1),
+    'resource': ('show_resource_apis', 0),
+    'schedulers': ('show_scheduler_jobs', 0)
+}
 
 class APIScanner:
-    def __init__(self):
-        self.settings = ConfigManager.get_settings() or {}
-        self.file_scanner = FileScanner(self.settings)
+    def __init__(self, settings=None, parallel=False):
+        self.settings = settings or ConfigManager.get_settings() or {}
+        if self.settings.get('discovery_engine') == 'Registry':
+            self.file_scanner = RegistryScanner(self.settings)
+        else:
+            self.file_scanner = FileScanner(self.settings, parallel=parallel)
         self.resource_scanner = ResourceScanner(self.settings)
         self.scheduler_scanner = SchedulerScanner(self.settings)
+        self.method_filter = get_method_filter(self.settings)
     
-    def scan_all_apis(self, user_context=None):
+    def scan_all_apis(self, user_context=None, fields=None):
+        """Every listed API projected to `fields`, with a `settings_version` instead of the settings and user context"""
         try:
             if not user_context:
                 user_context = AuthManager.get_current_user_context()
             
-            if not user_context.get("authenticated"):
-                raise frappe.AuthenticationError("Authentication required")
+            AuthManager.validate_api_access(None, user_context)
             
-            cache_key = f"apis_all_{frappe.session.user}"
-            cached = frappe.cache().get_value(cache_key)
-            if cached:
-                return cached
+            catalog = CatalogManager.get_catalog(self.settings)
+            if not catalog:
+                # Never scan inline; the background job builds the catalog
+                enqueue_catalog_rebuild()
+                return {"apps": {}, "catalog_building": True, "settings_version": get_generation()}
             
-            apps_data = {}
-            max_apis = self.settings.get('max_apis_per_app', 1000)
-            excluded_apps = [app.get('app_name') for app in self.settings.get('excluded_apps', []) if app.get('app_name')]
+            if catalog.get("stale"):
+                # Stale-while-revalidate: answer from the previous catalog, refresh in the background
+                enqueue_catalog_rebuild()
             
-            installed_apps = frappe.get_installed_apps()
-            for app in installed_apps:
-                if app not in excluded_apps:
-                    app_data = self._scan_app_apis(app, max_apis)
-                    if app_data:
-                        apps_data[app] = app_data
+            # The catalog is shared by all users, so each projection of it is built once per catalog version
+            apps = _projections.get_or_set(
+                ','.join(fields or ()),
+                lambda: {
+                    app: {category: project(apis, fields) for category, apis in categories.items()}
+                    for app, categories in catalog["apps"].items()
+                },
+                catalog["version"]
+            )
             
-            result = {"apps": apps_data, "user_context": user_context, "settings": self.settings}
-            frappe.cache().set_value(cache_key, result, expires_in_sec=300)
+            if self.settings.get('show_scheduler_jobs'):
+                # Run statistics are not part of the catalog, so scheduler entries are joined with them per response
+                apps = {
+                    app: dict(categories, schedulers=project(with_job_stats(catalog["apps"][app]["schedulers"]), fields))
+                    if "schedulers" in categories else categories
+                    for app, categories in apps.items()
+                }
             
-            return result
+            return {
+                "apps": apps,
+                "catalog_version": catalog["version"],
+                "catalog_complete": catalog.get("complete", True),
+                "settings_version": get_generation()
+            }
         except Exception as e:
             frappe.log_error(f"API scan error: {str(e)}")
-            return {"apps": {}, "user_context": user_context or {}, "settings": self.settings}
+            return {"apps": {}, "settings_version": get_generation()}
     
-    def _scan_app_apis(self, app, max_apis):
-        app_data = {}
-        excluded_methods = [method.get('method_path') for method in self.settings.get('excluded_api_methods', []) if method.get('method_path')]
+    def get_catalog_apps(self, user_context=None):
+        """The catalog's stored records per app and category and its version, or ({}, None) while it is being built"""
+        try:
+            if not user_context:
+                user_context = AuthManager.get_current_user_context()
+            
+            AuthManager.validate_api_access(None, user_context)
+            
+            catalog = CatalogManager.get_catalog(self.settings)
+            if not catalog or catalog.get("stale"):
+                enqueue_catalog_rebuild()
+            if not catalog:
+                return {}, None
+            return catalog["apps"], catalog["version"]
+        except Exception as e:
+            frappe.log_error(f"API scan error: {str(e)}")
+            return {}, None
+    
+    def get_catalog_delta(self, since_version, user_context=None, fields=None):
+        """APIs added, changed or removed since `since_version`, or `full` set when the client must reload the whole catalog"""
+        if not user_context:
+            user_context = AuthManager.get_current_user_context()
+        
+        AuthManager.validate_api_access(None, user_context)
+        
+        catalog = CatalogManager.get_catalog_meta(self.settings)
+        if not catalog:
+            enqueue_catalog_rebuild()
+            return {"catalog_building": True, "settings_version": get_generation()}
         
-        if self.settings.get('show_public_apis', 1):
-            apis = self.file_scanner.get_public_apis(app, max_apis)
-            app_data["public"] = [api for api in apis if api.get('path') not in excluded_methods]
+        if catalog.get("stale"):
+            enqueue_catalog_rebuild()
         
-        if self.settings.get('show_internal_apis', 1):
-            apis = self.file_scanner.get_internal_apis(app, max_apis)
-            app_data["internal"] = [api for api in apis if api.get('path') not in excluded_methods]
+        delta = {"version": catalog["version"], "since": since_version, "full": False, "changed": {}, "removed": {}, "settings_version": get_generation()}
+        previous = current = None
+        if since_version != catalog["version"]:
+            previous = CatalogManager.get_manifest(since_version)
+            current = CatalogManager.get_manifest(catalog["version"]) if catalog.get("complete", True) else None
+            if previous is None or current is None:
+                return dict(delta, full=True)
         
-        if self.settings.get('show_resource_apis', 0):
-            apis = self.resource_scanner.get_resource_apis(app, max_apis)
-            app_data["resource"] = [api for api in apis if api.get('path') not in excluded_methods]
+        apps = None
+        if current is not None or self.settings.get('show_scheduler_jobs'):
+            # Expired or rebuilt since the version was read; a delta against another catalog would be wrong
+            full_catalog = CatalogManager.get_catalog(self.settings)
+            if not full_catalog or full_catalog["version"] != catalog["version"]:
+                return dict(delta, full=True)
+            apps = full_catalog["apps"]
         
-        if self.settings.get('show_scheduler_jobs', 0):
-            apis = self.scheduler_scanner.get_scheduler_apis(app, max_apis)
-            app_data["schedulers"] = [api for api in apis if api.get('path') not in excluded_methods]
+        if current is not None:
+            for slice_key in current.keys() | previous.keys():
+                app, category = slice_key.split('::', 1)
+                hashes, previous_hashes = current.get(slice_key, {}), previous.get(slice_key, {})
+                
+                changed = [path for path, entry_hash in hashes.items() if previous_hashes.get(path) != entry_hash]
+                if changed:
+                    changed = set(changed)
+                    apis = [api for api in apps.get(app, {}).get(category, []) if api.get('path') in changed]
+                    delta["changed"].setdefault(app, {})[category] = project(apis, fields)
+                
+                removed = [path for path in previous_hashes if path not in hashes]
+                if removed:
+                    delta["removed"].setdefault(app, {})[category] = removed
+        
+        if self.settings.get('show_scheduler_jobs'):
+            # Run statistics don't change the catalog version, so scheduler entries are always re-sent with current ones
+            for app, categories in apps.items():
+                if categories.get("schedulers"):
+                    delta["changed"].setdefault(app, {})["schedulers"] = project(with_job_stats(categories["schedulers"]), fields)
+        
+        return delta
+    
+    def rebuild_catalog(self):
+        """Build the site-wide catalog and store it as the current version"""
+        apps_data = self.build_catalog()
+        return CatalogManager.set_catalog(self.settings, apps_data, complete=not self.file_scanner.incomplete_apps)
+    
+    def build_catalog(self):
+        apps_data = {}
+        max_apis = self.settings.get('max_apis_per_app', 1000)
+        excluded_apps = [app.get('app_name') for app in self.settings.get('excluded_apps', []) if app.get('app_name')]
+        
+        installed_apps = [app for app in frappe.get_installed_apps() if app not in excluded_apps]
+        
+        # Parse changed files of every app in one pass so parallel scans share a pool
+        if self.settings.get('show_public_apis', 1) or self.settings.get('show_internal_apis', 1):
+            self.file_scanner.prefetch(installed_apps)
+        
+        for app in installed_apps:
+            app_data = self._scan_app_apis(app, max_apis)
+            if app_data:
+                apps_data[app] = app_data
+        
+        return apps_data
+    
+    def get_app_apis(self, app, category, user_context=None):
+        """Return one app's APIs for one category, scanning only that slice if it isn't cached"""
+        if not self.is_listed(app, category, user_context):
+            return []
+        
+        apis = CatalogManager.get_app_category(self.settings, app, category)
+        if apis is not None:
+            return apis
+        
+        apis = self._scan_app_category(app, category, self.settings.get('max_apis_per_app', 1000))
+        
+        # A scan cut short by the time budget resumes from the index next time instead of being cached
+        if not self.file_scanner.incomplete_apps:
+            CatalogManager.set_app_category(self.settings, app, category, apis)
+        
+        return apis
+    
+    def get_app_api_page(self, app, category, page_size, page=1, cursor=None, search_query="", sort_by='name', sort_order='asc', user_context=None):
+        """Return one page of an app's APIs from the catalog table, or None while the table isn't current"""
+        if not CatalogTable.is_ready(self.settings):
+            return None
+        
+        if not self.is_listed(app, category, user_context):
+            return {'apis': [], 'total_items': 0, 'next_cursor': None, 'has_next': False}
+        
+        return CatalogTable.get_page(app, category, page_size, page=page, cursor=cursor,
+            search_query=search_query, sort_by=sort_by, sort_order=sort_order)
+    
+    def is_listed(self, app, category, user_context=None):
+        if not user_context:
+            user_context = AuthManager.get_current_user_context()
+        
+        AuthManager.validate_api_access(None, user_context)
+        
+        excluded_apps = [row.get('app_name') for row in self.settings.get('excluded_apps', []) if row.get('app_name')]
+        if app in excluded_apps or app not in frappe.get_installed_apps():
+            return False
+        
+        setting, default = CATEGORY_SETTINGS.get(category, (None, 0))
+        return bool(setting and self.settings.get(setting, default))
+    
+    def _scan_app_apis(self, app, max_apis):
+        app_data = {}
+        
+        for category, (setting, default) in CATEGORY_SETTINGS.items():
+            if self.settings.get(setting, default):
+                app_data[category] = self._scan_app_category(app, category, max_apis)
         
         return app_data if any(app_data.values()) else None
+    
+    def _scan_app_category(self, app, category, max_apis):
+        # File-scanned categories are filtered while scanning; the others are filtered here, once per scan
+        if category == 'public':
+            return self.file_scanner.get_public_apis(app, max_apis)
+        elif category == 'internal':
+            return self.file_scanner.get_internal_apis(app, max_apis)
+        elif category == 'resource':
+            return self.method_filter.filter(self.resource_scanner.get_resource_apis(app, max_apis))
+        elif category == 'schedulers':
+            return self.method_filter.filter(self.scheduler_scanner.get_scheduler_apis(app, max_apis))
+        return []
+
+def rebuild_catalog():
+    """Background job: rebuild the shared catalog without the per-request time budget, in parallel if configured"""
+    lock_token = CatalogManager.acquire_rebuild_lock()
+    if not lock_token:
+        return  # Another worker is already rebuilding
+    
+    try:
+        settings = dict(ConfigManager.get_settings() or {}, scan_time_budget=0)
+        previous_version = CatalogManager.get_version(settings)
+        catalog = APIScanner(settings, parallel=True).rebuild_catalog()
+        
+        # Search indexes are built once per catalog version, here instead of in the first search request
+        if catalog["complete"] and catalog["version"] != previous_version:
+            CatalogManager.build_search_indexes(settings, catalog)
+        return catalog["version"]
+    except Exception as e:
+        frappe.log_error(f"Catalog rebuild error: {str(e)}", "API Explorer")
+    finally:
+        CatalogManager.release_rebuild_lock(lock_token)
+
+def enqueue_catalog_rebuild():
+    """Queue a catalog rebuild; concurrent requests share a single queued job"""
+    try:
+        frappe.enqueue(
+            'api_explorer.core.scanner.manager.rebuild_catalog',
+            queue='long',
+            job_id=f"api_explorer_catalog_rebuild::{frappe.local.site}",
+            deduplicate=True,
+            enqueue_after_commit=True
+        )
+    except Exception as e:
+        frappe.log_error(f"Catalog rebuild enqueue error: {str(e)}", "API Explorer")
+
+def build_search_index(app, category):
+    """Background job: index one slice of the current catalog, when its index was evicted or expired"""
+    try:
+        settings = ConfigManager.get_settings()
+        catalog = CatalogManager.get_catalog_meta(settings)
+        if not catalog or not catalog.get('complete', True):
+            return  # The rebuild that completes the catalog indexes it
+        
+        apis = CatalogManager.get_app_category(settings, app, category)
+        if apis:
+            CatalogManager.set_search_index(settings, app, category, apis, catalog['version'])
+    except Exception as e:
+        frappe.log_error(f"Search index build error: {str(e)}", "API Explorer")
+
+def enqueue_search_index_build(app, category):
+    try:
+        frappe.enqueue(
+            'api_explorer.core.scanner.manager.build_search_index',
+            queue='long',
+            job_id=f"api_explorer_search_index::{frappe.local.site}::{app}::{category}",
+            deduplicate=True,
+            app=app,
+            category=category
+        )
+    except Exception as e:
+        frappe.log_error(f"Search index enqueue error: {str(e)}", "API Explorer")
 
 @frappe.whitelist(xss_safe=False)
-def scan_apis():
+def scan_apis(fields=None):
+    # Validated outside the try so a bad argument is an error response, not an empty catalog
+    fields = parse_fields(fields)
     try:
         scanner = APIScanner()
-        return scanner.scan_all_apis()
+        
+        # The response is fully determined by catalog version, settings version, fields and scheduler statistics
+        stats_version = get_stats_version() if scanner.settings.get('show_scheduler_jobs') else None
+        catalog = CatalogManager.get_catalog_meta(scanner.settings)
+        if catalog:
+            AuthManager.validate_api_access(None)
+            if is_not_modified(make_etag(catalog["version"], get_generation(), fields, stats_version)):
+                if catalog.get("stale"):
+                    enqueue_catalog_rebuild()  # scan_all_apis would have, but it is skipped
+                return None
+        
+        result = scanner.scan_all_apis(fields=fields)
+        if result.get("catalog_version") and (not catalog or result["catalog_version"] != catalog["version"]):
+            # Rebuilt in between; tag the response with what was actually sent
+            set_response_header('ETag', make_etag(result["catalog_version"], get_generation(), fields, stats_version))
+        return result
     except Exception as e:
         frappe.log_error(f"Scan APIs error: {str(e)}")
-        return {"apps": {}, "user_context": {}, "settings": {}}
+        return {"apps": {}}
+
+@frappe.whitelist(xss_safe=False)
+def get_catalog_delta(since_version, fields=None):
+    """Only what changed since the catalog version the client holds"""
+    fields = parse_fields(fields)
+    try:
+        return APIScanner().get_catalog_delta(since_version, fields=fields)
+    except Exception as e:
+        frappe.log_error(f"Catalog delta error: {str(e)}")
+        return {"full": True}
+
+@frappe.whitelist(xss_safe=False)
+def get_api_details(api_path):
+    """Full description of one API, fetched when it is opened instead of shipped with every list"""
+    try:
+        from api_explorer.core.scanner.details import get_api_details as read_api_details
+        
+        details = read_api_details(APIScanner(), api_path)
+        if not details:
+            return {"error": f"API not found: {api_path}"}
+        return details
+    except Exception as e:
+        frappe.log_error(f"Get API details error: {str(e)}")
+        return {"error": str(e)}
 
 @frappe.whitelist(methods=['POST'], xss_safe=False)
 def clear_cache():
-    """Clear all API Explorer caches for current user"""
+    """Invalidate every API Explorer cache for all users and workers, then rebuild the catalog"""
+    # Site-wide and followed by a full rebuild, so not for every logged-in user
+    frappe.only_for("System Manager")
     try:
-        user = frappe.session.user
-        cleared_items = []
-        
-        # Clear API scan cache
-        api_cache_key = f"apis_all_{user}"
-        if frappe.cache().delete_value(api_cache_key):
-            cleared_items.append("API scan cache")
-        
-        # Clear settings cache (global)
-        if frappe.cache().delete_value("api_explorer_settings"):
-            cleared_items.append("Settings cache")
-        
-        # Clear pagination memory cache
-        from api_explorer.api.pagination import _cache
-        pagination_keys = [key for key in list(_cache.keys()) if user in key]
-        for key in pagination_keys:
-            _cache.pop(key, None)
-        if pagination_keys:
-            cleared_items.append(f"Pagination cache ({len(pagination_keys)} keys)")
-        
-        # Clear all user-specific API Explorer caches
-        try:
-            pattern_keys = frappe.cache().get_keys(f"*{user}*api_explorer*")
-            for key in pattern_keys:
-                frappe.cache().delete_value(key)
-            if pattern_keys:
-                cleared_items.append(f"User caches ({len(pattern_keys)} keys)")
-        except:
-            pass
-        
-        # Clear file scanner cache
-        try:
-            from api_explorer.core.scanner.file_scanner import FileScanner
-            if hasattr(FileScanner, '_function_cache'):
-                FileScanner._function_cache.clear()
-                cleared_items.append("File scanner cache")
-        except:
-            pass
+        from api_explorer.core.cache.manager import bump_generation
+        
+        # Settings, catalog, catalog table state and shared worker caches all live under the generation.
+        # The scan index is validated by file content, so it stays and the rebuild only re-parses changed files
+        generation = bump_generation()
+        TieredCache.clear_all_local()
+        cleared_items = [f"API Explorer caches (generation {generation})"]
+        
+        enqueue_catalog_rebuild()
         
         return {
             "success": True, 
-            "message": f"Cleared: {', '.join(cleared_items) if cleared_items else 'No caches found'}"
+            "message": f"Cleared: {', '.join(cleared_items)}"
         }
     except Exception as e:
         frappe.log_error(f"Cache clear error: {str(e)}", "API Explorer Cache")
-        return {"success": False, "message": str(e)}
\ No newline at end of file
+        return {"success": False, "message": str(e)}
@@ -0,0 +1,164 @@
+import frappe
+import json
+import re
+import sys
+from collections import namedtuple
+
+# Identical signatures (e.g. `def get(name)`) share one parameter tuple per process
+_shared_params = {}
+
+# Only the first line of a docstring is kept in the catalog, for search; details read the full text
+DOCSTRING_SUMMARY_LENGTH = 160
+
+# Limits for the `fields` projection accepted by list endpoints
+MAX_FIELDS = 32
+_field_pattern = re.compile(r'^[a-z_][a-z0-9_]{0,63}$')
+
+class APIParam(namedtuple('APIParam', ['name', 'type', 'required'])):
+    __slots__ = ()
+    
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "type": self.type,
+            "required": self.required,
+            "description": "",
+            "default_value": ""
+        }
+
+def summarize_docstring(docstring):
+    """First line of a docstring, shortened to DOCSTRING_SUMMARY_LENGTH"""
+    return (docstring or '').strip().split('\n', 1)[0].strip()[:DOCSTRING_SUMMARY_LENGTH]
+
+def share_params(params):
+    """Return a canonical tuple for these parameters so repeated signatures are stored once"""
+    params = tuple(APIParam(sys.intern(p[0]), sys.intern(p[1]), bool(p[2])) for p in params)
+    return _shared_params.setdefault(params, params)
+
+class APIRecord:
+    """Compact record for a discovered function"""
+    __slots__ = ('name', 'path', 'parameters', 'file_path', 'line_number', 'is_whitelisted', 'allow_guest', 'docstring')
+    
+    def __init__(self, name, path, parameters, file_path, line_number, is_whitelisted=False, allow_guest=False, docstring=""):
+        self.name = sys.intern(name)
+        self.path = sys.intern(path)
+        self.parameters = share_params(parameters)
+        self.file_path = sys.intern(file_path) if file_path else file_path
+        self.line_number = line_number
+        self.is_whitelisted = bool(is_whitelisted)
+        self.allow_guest = bool(allow_guest)
+        self.docstring = docstring or ""
+    
+    def __reduce__(self):
+        # Shared parameter tuples are the same object, so pickle's memo writes each signature once
+        return (APIRecord, (self.name, self.path, self.parameters, self.file_path,
+            self.line_number, self.is_whitelisted, self.allow_guest, self.docstring))
+    
+    @classmethod
+    def from_shared(cls, name, path, parameters, file_path, line_number, is_whitelisted, allow_guest, docstring=""):
+        """Fast constructor for callers that already hold shared parameters and interned strings"""
+        record = object.__new__(cls)
+        record.name = name
+        record.path = path
+        record.parameters = parameters
+        record.file_path = file_path
+        record.line_number = line_number
+        record.is_whitelisted = is_whitelisted
+        record.allow_guest = allow_guest
+        record.docstring = docstring
+        return record
+    
+    def __eq__(self, other):
+        return isinstance(other, APIRecord) and self.__reduce__() == other.__reduce__()
+    
+    def __hash__(self):
+        return hash(self.path)
+    
+    def __repr__(self):
+        return f"APIRecord({self.path})"
+    
+    @property
+    def location(self):
+        return self.path
+    
+    def __getitem__(self, key):
+        value = self.get(key, _missing)
+        if value is _missing:
+            raise KeyError(key)
+        return value
+    
+    def get(self, key, default=None):
+        if key == 'location':
+            return self.path
+        if key == 'parameters':
+            return [p.as_dict() for p in self.parameters]
+        if key == 'param_count':
+            return len(self.parameters)
+        if key in self.__slots__:
+            return getattr(self, key)
+        return default
+    
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "path": self.path,
+            "location": self.path,
+            "docstring": self.docstring,
+            "parameters": [p.as_dict() for p in self.parameters],
+            "file_path": self.file_path,
+            "line_number": self.line_number,
+            "is_whitelisted": self.is_whitelisted,
+            "allow_guest": self.allow_guest
+        }
+    
+    def as_summary(self):
+        """Identity fields for API lists; the rest is served on demand by get_api_details"""
+        return {
+            "name": self.name,
+            "path": self.path,
+            "param_count": len(self.parameters),
+            "is_whitelisted": self.is_whitelisted,
+            "allow_guest": self.allow_guest
+        }
+
+_missing = object()
+
+def to_summaries(apis):
+    """Convert a list of records to list entries; resource and scheduler dicts pass through"""
+    return [api.as_summary() if isinstance(api, APIRecord) else api for api in apis]
+
+def project(apis, fields=None):
+    """List entries holding only the `fields` each API has, or the default list entries without them"""
+    if not fields:
+        return to_summaries(apis)
+    
+    entries = []
+    for api in apis:
+        entry = {}
+        for field in fields:
+            value = api.get(field, _missing)
+            if value is not _missing:
+                entry[field] = value
+        entries.append(entry)
+    return entries
+
+def parse_fields(fields):
+    """Read a `fields` argument, a comma-separated string or a JSON list, raising a ValidationError when it is invalid"""
+    if not fields:
+        return None
+    if isinstance(fields, str):
+        try:
+            fields = json.loads(fields) if fields.lstrip().startswith('[') else fields.split(',')
+        except ValueError:
+            fields = None
+    
+    if isinstance(fields, (list, tuple)):
+        fields = tuple(dict.fromkeys(str(field).strip() for field in fields if str(field).strip()))
+    if not isinstance(fields, tuple) or len(fields) > MAX_FIELDS or not all(_field_pattern.match(field) for field in fields):
+        frappe.throw(f"Invalid fields: pass up to {MAX_FIELDS} field names as a comma-separated string or a JSON list", frappe.ValidationError)
+    return fields or None
+
+def json_default(value):
+    if isinstance(value, APIRecord):
+        return value.as_dict()
+    return str(value)
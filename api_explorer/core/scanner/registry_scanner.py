@@ -0,0 +1,98 @@
+import frappe
+import importlib
+import inspect
+import pkgutil
+from api_explorer.core.scanner.file_scanner import FileScanner
+from api_explorer.core.scanner.records import APIRecord, summarize_docstring
+
+class RegistryScanner(FileScanner):
+    """Discovery engine built on frappe's runtime whitelist registry"""
+    excluded_modules = ('tests', 'patches', 'migrations')
+    
+    def iter_apis(self, apps):
+        self.incomplete_apps = set()
+        apps = set(apps)
+        
+        for app in apps:
+            self._import_app_modules(app)
+        
+        guest_methods = set(frappe.guest_methods)
+        for fn in list(frappe.whitelisted):
+            func_info = self._create_api_info_from_callable(fn, fn in guest_methods)
+            app = func_info.path.split('.', 1)[0] if func_info else None
+            if app not in apps:
+                continue
+            
+            category = self._categorize(func_info)
+            if category:
+                yield app, category, func_info
+    
+    def _import_app_modules(self, app):
+        """Import every module of the app so their decorators register with frappe"""
+        try:
+            package = importlib.import_module(app)
+        except Exception as e:
+            frappe.log_error(f"Error importing {app}: {str(e)}", "API Explorer")
+            return
+        
+        for module in pkgutil.walk_packages(package.__path__, f"{app}.", onerror=lambda name: None):
+            parts = module.name.split('.')
+            if any(part in self.excluded_modules or part.startswith(tuple(self.excluded_prefixes)) for part in parts[1:]):
+                continue
+            try:
+                importlib.import_module(module.name)
+            except Exception:
+                pass  # Broken or optional-dependency modules are skipped like unparsable files
+    
+    @staticmethod
+    def _create_api_info_from_callable(fn, allow_guest):
+        try:
+            # Methods of classes are served by run_doc_method, not /api/method
+            if '.' in fn.__qualname__ or fn.__name__.startswith('_'):
+                return None
+            
+            full_path = f"{fn.__module__}.{fn.__name__}"
+            source = inspect.unwrap(fn)
+            
+            return APIRecord(
+                fn.__name__,
+                full_path,
+                RegistryScanner._analyze_signature(fn),
+                inspect.getsourcefile(source),
+                source.__code__.co_firstlineno,
+                True,
+                allow_guest,
+                summarize_docstring(inspect.getdoc(source))
+            )
+        except Exception:
+            return None
+    
+    @staticmethod
+    def _analyze_signature(fn):
+        params = []
+        try:
+            for name, param in inspect.signature(fn).parameters.items():
+                if name in ('self', 'cls') or param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+                    continue
+                
+                params.append((name, RegistryScanner._get_annotation_type(param.annotation), param.default is inspect.Parameter.empty))
+        except Exception:
+            pass
+        
+        return params
+    
+    @staticmethod
+    def _get_annotation_type(annotation):
+        if annotation is inspect.Parameter.empty:
+            return 'string'
+        
+        type_map = {
+            'int': 'integer',
+            'float': 'number',
+            'bool': 'boolean',
+            'str': 'string',
+            'dict': 'object',
+            'list': 'array'
+        }
+        type_name = getattr(annotation, '__name__', str(annotation)).lower()
+        return type_map.get(type_name, 'string')
@@ -1,20 +1,24 @@
 import frappe
+from api_explorer.core.cache.manager import TieredCache
+from api_explorer.core.scanner.table_stats import get_large_table_threshold, get_table_stats
+
+# DocType names per app, shared by all scans and versioned by the DocType table itself
+_doctypes_by_app = TieredCache('resource_doctypes', ttl=3600, max_bytes=4 * 1024 * 1024)
 
 class ResourceScanner:
     def __init__(self, settings):
         self.settings = settings
+        self._doctypes = None
     
     def get_resource_apis(self, app, max_apis):
         apis = []
         try:
-            doctypes = frappe.get_all("DocType", 
-                filters={"module": ["like", f"%{app}%"]}, 
-                fields=["name"], 
-                limit=max_apis//4
-            )
+            table_stats = get_table_stats()
+            threshold = get_large_table_threshold(self.settings)
             
-            for doctype in doctypes:
-                dt_name = doctype.name
+            for dt_name in self.get_app_doctypes(app)[:max_apis//4]:
+                stats = table_stats.get(dt_name, {})
+                estimated_rows = stats.get('estimated_rows')
                 apis.extend([
                     {
                         "name": f"List {dt_name}",
@@ -24,7 +28,10 @@ class ResourceScanner:
                         "docstring": f"Get list of {dt_name} records",
                         "parameters": [],
                         "resource_api": True,
-                        "doctype": dt_name
+                        "doctype": dt_name,
+                        "estimated_rows": estimated_rows,
+                        "indexes": stats.get('indexes', []),
+                        "cost_hint": get_cost_hint(estimated_rows, threshold)
                     },
                     {
                         "name": f"Get {dt_name}",
@@ -34,7 +41,8 @@ class ResourceScanner:
                         "docstring": f"Get a {dt_name} record by name",
                         "parameters": [],
                         "resource_api": True,
-                        "doctype": dt_name
+                        "doctype": dt_name,
+                        "estimated_rows": estimated_rows
                     }
                 ])
                 
@@ -44,3 +52,35 @@ class ResourceScanner:
             frappe.log_error(f"Error getting resource APIs for {app}: {str(e)}")
         
         return apis[:max_apis]
+    
+    def get_app_doctypes(self, app):
+        if self._doctypes is None:
+            self._doctypes = self._load_doctypes()
+        return self._doctypes.get(app, [])
+    
+    @staticmethod
+    def _load_doctypes():
+        """Map every app to its DocTypes with one query, by the app of each DocType's module (Module Def.app_name)"""
+        # Any DocType insert, delete or edit changes this stamp
+        version = tuple(str(value) for value in frappe.db.sql("select count(*), max(modified) from `tabDocType`")[0])
+        doctypes = _doctypes_by_app.get('all', version)
+        if doctypes is not None:
+            return doctypes
+        
+        doctypes = {}
+        for name, app in frappe.db.sql("""
+            select dt.name, md.app_name
+            from `tabDocType` dt
+            inner join `tabModule Def` md on md.name = dt.module
+            order by dt.name
+        """):
+            doctypes.setdefault(app, []).append(name)
+        
+        _doctypes_by_app.set('all', doctypes, version)
+        return doctypes
+
+def get_cost_hint(estimated_rows, threshold):
+    """Warning shown on list APIs of tables above the large table threshold"""
+    if not threshold or not estimated_rows or estimated_rows < threshold:
+        return None
+    return f"Large table (~{estimated_rows:,} rows): always pass limit_page_length and filter on an indexed field"
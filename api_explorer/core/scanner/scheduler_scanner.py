@@ -1,27 +1,153 @@
 import frappe
+from frappe.utils import add_days, now_datetime
+
+# Run statistics of every scheduled job, written by the hourly aggregation job
+STATS_KEY = 'api_explorer_scheduler_stats'
+STATS_TTL = 3 * 3600
+STATS_WINDOW_DAYS = 7
+
+# Change with every run, so they are joined at response time and never enter the catalog or its version
+STATS_FIELDS = ('last_run', 'last_status', 'runs', 'avg_duration', 'p95_duration', 'busy_seconds', 'failure_rate')
 
 class SchedulerScanner:
     def __init__(self, settings):
         self.settings = settings
+        self._jobs = None
     
     def get_scheduler_apis(self, app, max_apis):
-        schedulers = []
+        if self._jobs is None:
+            self._jobs = self._load_jobs()
+        return self._jobs.get(app, [])[:max_apis]
+    
+    @staticmethod
+    def _load_jobs():
+        """Map every app to its scheduled jobs with one query on Scheduled Job Type instead of reading hooks per app"""
+        jobs = {}
         try:
-            hooks = frappe.get_hooks("scheduler_events", app_name=app)
-            for event_type, methods in hooks.items():
-                for method in methods:
-                    if len(schedulers) >= max_apis:
-                        break
-                    schedulers.append({
-                        "name": method.split('.')[-1],
-                        "path": method,
-                        "location": method,
-                        "docstring": f"Scheduled task: {event_type}",
-                        "frequency": event_type,
-                        "scheduler": True,
-                        "parameters": []
-                    })
+            for method, frequency, cron_format, stopped in frappe.db.sql("""
+                select method, frequency, cron_format, stopped
+                from `tabScheduled Job Type`
+                where coalesce(server_script, '') = ''
+                order by method
+            """):
+                jobs.setdefault(method.split('.', 1)[0], []).append({
+                    "name": method.split('.')[-1],
+                    "path": method,
+                    "location": method,
+                    "docstring": f"Scheduled task: {frequency}",
+                    "frequency": cron_format if frequency == 'Cron' else frequency,
+                    "scheduler": True,
+                    "parameters": [],
+                    "queue": get_queue_name(frequency),
+                    "stopped": bool(stopped)
+                })
         except Exception as e:
-            frappe.log_error(f"Error getting scheduler APIs for {app}: {str(e)}")
+            frappe.log_error(f"Error getting scheduler APIs: {str(e)}")
         
-        return schedulers
+        return jobs
+
+def with_job_stats(apis):
+    """Scheduler entries joined with their current run statistics; other entries pass through"""
+    jobs = get_job_stats()['jobs']
+    entries = []
+    for api in apis:
+        if api.get('scheduler'):
+            api = dict(api, **dict.fromkeys(STATS_FIELDS))
+            api['runs'] = 0
+            api.update(jobs.get(api['path']) or {})
+        entries.append(api)
+    return entries
+
+def get_queue_name(frequency):
+    # Mirrors ScheduledJobType.get_queue_name
+    return 'long' if ('Long' in frequency or 'Maintenance' in frequency) else 'default'
+
+def get_job_stats():
+    """Job method -> run statistics, read once per request; missing statistics are aggregated by a queued job"""
+    stats = getattr(frappe.local, 'api_explorer_job_stats', None)
+    if stats is None:
+        stats = frappe.cache().get_value(STATS_KEY)
+        if stats is None:
+            enqueue_job_stats()
+            stats = {'version': None, 'jobs': {}}
+        frappe.local.api_explorer_job_stats = stats
+    return stats
+
+def get_stats_version():
+    """Changes whenever the statistics are re-aggregated; part of the validators of responses that carry them"""
+    return get_job_stats()['version']
+
+def enqueue_job_stats():
+    try:
+        frappe.enqueue(
+            'api_explorer.core.scanner.scheduler_scanner.refresh_job_stats',
+            job_id=f"api_explorer_scheduler_stats::{frappe.local.site}",
+            deduplicate=True,
+            enqueue_after_commit=True
+        )
+    except Exception as e:
+        frappe.log_error(f"Scheduler stats enqueue error: {str(e)}", "API Explorer")
+
+def refresh_job_stats():
+    """Hourly job: precompute run statistics while scheduler jobs are listed"""
+    from api_explorer.core.config.manager import ConfigManager
+    
+    if (ConfigManager.get_settings() or {}).get('show_scheduler_jobs'):
+        aggregate_job_stats()
+
+def aggregate_job_stats():
+    """Summarize the last week of Scheduled Job Log per job method and store it for responses"""
+    # A run lasts from the log's creation (job start) to its last update (completion or failure)
+    if frappe.db.db_type == 'postgres':
+        duration = "extract(epoch from (log.modified - log.creation))"
+    else:
+        duration = "timestampdiff(microsecond, log.creation, log.modified) / 1000000"
+    
+    try:
+        jobs = {
+            method: {"last_run": str(last_execution)}
+            for method, last_execution in frappe.db.sql("""
+                select method, last_execution
+                from `tabScheduled Job Type`
+                where last_execution is not null
+            """)
+        }
+        
+        # Reduced here rather than in SQL because percentiles aren't portable across MariaDB and Postgres
+        runs = {}
+        for method, status, seconds, started in frappe.db.sql(f"""
+            select job.method, log.status, {duration}, log.creation
+            from `tabScheduled Job Log` log
+            join `tabScheduled Job Type` job on job.name = log.scheduled_job_type
+            where log.creation >= %s and log.status in ('Complete', 'Failed')
+            order by job.method, log.creation
+        """, (add_days(now_datetime(), -STATS_WINDOW_DAYS),)):
+            runs.setdefault(method, []).append((status, float(seconds or 0), started))
+        
+        for method, job_runs in runs.items():
+            jobs[method] = summarize_runs(job_runs)
+        
+        stats = {'version': frappe.generate_hash(length=10), 'jobs': jobs}
+        frappe.cache().set_value(STATS_KEY, stats, expires_in_sec=STATS_TTL)
+        return stats
+    except Exception as e:
+        frappe.log_error(f"Scheduler stats error: {str(e)}", "API Explorer")
+        return None
+
+def summarize_runs(runs):
+    """Last run, average and p95 duration, total busy time and failure rate of runs in start order"""
+    durations = sorted(seconds for _, seconds, _ in runs)
+    failures = sum(1 for status, _, _ in runs if status == 'Failed')
+    last_status, _, last_started = runs[-1]
+    # Nearest-rank percentile
+    p95 = durations[max(-(-len(durations) * 95 // 100) - 1, 0)]
+    
+    return {
+        "runs": len(runs),
+        "last_run": str(last_started),
+        "last_status": last_status,
+        "avg_duration": round(sum(durations) / len(durations), 2),
+        "p95_duration": round(p95, 2),
+        "busy_seconds": round(sum(durations), 1),
+        "failure_rate": round(failures * 100 / len(runs), 1)
+    }
@@ -0,0 +1,69 @@
+import frappe
+import re
+from api_explorer.core.cache.manager import TieredCache
+
+# Row estimates and indexes of every DocType table, read in one query per site
+_table_stats = TieredCache('table_stats', ttl=3600, max_bytes=8 * 1024 * 1024)
+
+DEFAULT_LARGE_TABLE_THRESHOLD = 1000000
+
+def get_table_stats():
+    """DocType -> {'estimated_rows', 'indexes': [[column, ...], ...]} from the engine's estimates, never counting rows"""
+    stats = _table_stats.get('all')
+    if stats is None:
+        try:
+            stats = _read_postgres_stats() if frappe.db.db_type == 'postgres' else _read_mariadb_stats()
+        except Exception as e:
+            frappe.log_error(f"Table stats error: {str(e)}", "API Explorer")
+            return {}
+        _table_stats.set('all', stats)
+    return stats
+
+def get_large_table_threshold(settings):
+    threshold = settings.get('large_table_threshold')
+    return DEFAULT_LARGE_TABLE_THRESHOLD if threshold is None else int(threshold or 0)
+
+def round_estimate(rows):
+    """Keep one significant digit so drifting estimates don't change the catalog version on every rebuild"""
+    rows = int(rows or 0)
+    if rows < 10:
+        return max(rows, 0)
+    scale = 10 ** (len(str(rows)) - 1)
+    return round(rows / scale) * scale
+
+def _read_mariadb_stats():
+    stats = {}
+    for table, rows, index, column in frappe.db.sql("""
+        select t.table_name, t.table_rows, s.index_name, s.column_name
+        from information_schema.tables t
+        left join information_schema.statistics s
+            on s.table_schema = t.table_schema and s.table_name = t.table_name
+        where t.table_schema = database() and t.table_name like 'tab%%'
+        order by t.table_name, s.index_name, s.seq_in_index
+    """):
+        _add_row(stats, table, rows, index, [column] if column else [])
+    return _finish(stats)
+
+def _read_postgres_stats():
+    stats = {}
+    for table, rows, index, definition in frappe.db.sql("""
+        select c.relname, c.reltuples, i.indexname, i.indexdef
+        from pg_class c
+        left join pg_indexes i on i.schemaname = current_schema() and i.tablename = c.relname
+        where c.relkind = 'r' and c.relnamespace = current_schema()::regnamespace and c.relname like 'tab%%'
+        order by c.relname, i.indexname
+    """):
+        columns = re.search(r'\(([^()]*)\)\s*$', definition or '')
+        columns = [column.strip().strip('"') for column in columns.group(1).split(',')] if columns else []
+        _add_row(stats, table, rows, index, columns)
+    return _finish(stats)
+
+def _add_row(stats, table, rows, index, columns):
+    entry = stats.setdefault(table[3:], {'estimated_rows': round_estimate(rows), 'indexes': {}})
+    if index:
+        entry['indexes'].setdefault(index, []).extend(columns)
+
+def _finish(stats):
+    for entry in stats.values():
+        entry['indexes'] = sorted(entry['indexes'].values())
+    return stats
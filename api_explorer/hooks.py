@@ -15,6 +15,25 @@ fixtures = [
 ]
 
 after_install = "api_explorer.install.after_install"
+after_migrate = ["api_explorer.core.scanner.manager.enqueue_catalog_rebuild"]
+
+# Keep the shared API catalog warm so no request has to scan inline
+scheduler_events = {
+	"hourly": [
+		"api_explorer.core.scanner.scheduler_scanner.refresh_job_stats"
+	],
+	"hourly_long": [
+		"api_explorer.core.scanner.manager.rebuild_catalog"
+	]
+}
+
+# Drop a user's cached API Explorer context when their roles or user type change
+doc_events = {
+	"User": {
+		"on_update": "api_explorer.core.auth.manager.clear_user_context",
+		"on_trash": "api_explorer.core.auth.manager.clear_user_context"
+	}
+}
 
 
 
@@ -25,11 +25,22 @@ def after_install():
 				"maintain_user_history": 1,
 				"include_tokens_in_code": 0,
 				"max_apis_per_app": 1000,
+				"discovery_engine": "AST",
+				"scan_workers": 0,
+				"scan_time_budget": 20,
+				"catalog_soft_ttl": 300,
+				"catalog_hard_ttl": 86400,
+				"catalog_storage": "Cache",
+				"large_table_threshold": 1000000,
 				"allowed_user_roles": [
 					{"role": "Administrator"}
 				]
 			})
 			doc.insert(ignore_permissions=True)
 			frappe.db.commit()
+		
+		# Pre-warm the API catalog in the background
+		from api_explorer.core.scanner.manager import enqueue_catalog_rebuild
+		enqueue_catalog_rebuild()
 	except Exception as e:
 		frappe.log_error(f"API Explorer installation error: {str(e)}", "API Explorer Install")
@@ -151,6 +151,7 @@ const App = {
       if (this.searchQuery !== this.searchText) {
         this.searchQuery = this.searchText;
         this.currentPage = 1;
+        this.pageCursors = {};
         this.contentLoading = true;
         
         // Instant local search if no server-side search needed
@@ -223,6 +224,7 @@ const App = {
         this.selectedCategory = category;
         this.selectedFavorite = null;
         this.currentPage = 1;
+        this.pageCursors = {};
         
         // Always use API call for proper pagination
         this.contentLoading = true;
@@ -237,7 +239,11 @@ const App = {
       if (this.activeRequest === requestKey) return;
       this.activeRequest = requestKey;
       try {
-        const url = `/api/method/api_explorer.api.pagination.get_paginated_apis?app_name=${encodeURIComponent(this.selectedApp)}&category=${encodeURIComponent(this.selectedCategory)}&page=${this.currentPage}&search_query=${encodeURIComponent(this.searchQuery)}`;
+        let url = `/api/method/api_explorer.api.pagination.get_paginated_apis?app_name=${encodeURIComponent(this.selectedApp)}&category=${encodeURIComponent(this.selectedCategory)}&page=${this.currentPage}&search_query=${encodeURIComponent(this.searchQuery)}`;
+        
+        // Database-backed catalogs hand out a cursor for the next page (keyset pagination)
+        const cursor = this.pageCursors[this.currentPage];
+        if (cursor) url += `&cursor=${encodeURIComponent(cursor)}`;
         
         const response = await fetch(url, { 
           method: 'GET',
@@ -251,6 +257,9 @@ const App = {
           this.paginatedApis = data.message.apis;
           this.paginationInfo = data.message.pagination;
           this.paginationSettings = data.message.settings;
+          if (data.message.pagination.next_cursor) {
+            this.pageCursors[this.currentPage + 1] = data.message.pagination.next_cursor;
+          }
         }
       } catch (e) {
         this.paginatedApis = [];
@@ -321,9 +330,17 @@ const App = {
       }
     },
     
-    initializeApiParameters(api) {
-      if (!this.apiParameters[api.path] && api.parameters) {
-        this.apiParameters[api.path] = api.parameters.map(param => ({
+    async initializeApiParameters(api) {
+      let parameters = api.parameters;
+      
+      // List entries only carry a parameter count; the signature is fetched when the API is opened
+      if (!this.apiParameters[api.path] && !parameters && api.param_count) {
+        const details = await ApiService.getApiDetails(api.path);
+        parameters = (details?.parameters || []).filter(param => !param.kind || !param.kind.startsWith('var_'));
+      }
+      
+      if (!this.apiParameters[api.path] && parameters) {
+        this.apiParameters[api.path] = parameters.map(param => ({
           key: param.name || param,
           value: ''
         }));
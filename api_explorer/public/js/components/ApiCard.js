@@ -12,6 +12,7 @@ const ApiCard = {
             <div class="api-method">{{ api.name || api.api_name }}</div>
             <div class="api-path">{{ api.display_path || api.path || api.api_path }}</div>
             <div v-if="api.scheduler" class="api-frequency">{{ api.frequency }}</div>
+            <div v-if="api.cost_hint" class="api-frequency">⚠ {{ api.cost_hint }}</div>
           </div>
         </div>
         <div class="api-actions">
@@ -65,6 +66,22 @@ const ApiCard = {
               <span class="scheduler-label">Description:</span>
               <span class="scheduler-value">{{ api.docstring }}</span>
             </div>
+            <div v-if="api.queue" class="scheduler-item">
+              <span class="scheduler-label">Queue:</span>
+              <span class="scheduler-value">{{ api.queue }}</span>
+            </div>
+            <div v-if="api.last_run" class="scheduler-item">
+              <span class="scheduler-label">Last Run:</span>
+              <span class="scheduler-value">{{ api.last_run }}</span>
+            </div>
+            <div v-if="api.avg_duration != null" class="scheduler-item">
+              <span class="scheduler-label">Duration (avg / p95):</span>
+              <span class="scheduler-value">{{ api.avg_duration }}s / {{ api.p95_duration }}s</span>
+            </div>
+            <div v-if="api.failure_rate != null" class="scheduler-item">
+              <span class="scheduler-label">Failure Rate:</span>
+              <span class="scheduler-value">{{ api.failure_rate }}%</span>
+            </div>
           </div>
         </div>
       </div>
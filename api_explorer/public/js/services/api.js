@@ -14,6 +14,21 @@ class ApiService {
     }
   }
   
+  static async getApiDetails(apiPath) {
+    try {
+      const response = await fetch(`/api/method/api_explorer.core.scanner.manager.get_api_details?api_path=${encodeURIComponent(apiPath)}`, {
+        headers: {
+          'X-Frappe-CSRF-Token': ApiService.getCSRFToken() || ''
+        }
+      });
+      if (!response.ok) return null;
+      const data = await response.json();
+      return data.message || null;
+    } catch (e) {
+      return null;
+    }
+  }
+  
   static async executeApi(apiPath, parameters = {}, files = []) {
     try {
       const formData = new FormData();
@@ -32,6 +32,7 @@ class StateManager {
       paginatedApis: [],
       paginationInfo: {},
       paginationSettings: {},
+      pageCursors: {},
       activeRequest: null
     };
   }
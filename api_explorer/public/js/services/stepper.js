@@ -158,17 +158,105 @@ class StepperService {
         throw new Error('Not authenticated for API scanning');
       }
       
-      const response = await fetch('/api/method/api_explorer.core.scanner.manager.scan_apis');
-      if (!response.ok) {
-        return {};
+      // The sidebar, API cards, local search and favorites only need these fields; details are fetched per API
+      const fields = 'name,path,display_path,docstring,cost_hint,scheduler,frequency,param_count,queue,last_run,avg_duration,p95_duration,failure_rate';
+      const cached = this.loadCachedCatalog(fields, userContext.user);
+      
+      // The catalog is built by a background job; wait for it while it is being built
+      for (let attempt = 0; attempt < 60; attempt++) {
+        let data = null;
+        
+        if (cached) {
+          // Only fetch what changed since the catalog kept from the last visit
+          const response = await fetch(`/api/method/api_explorer.core.scanner.manager.get_catalog_delta?since_version=${encodeURIComponent(cached.version)}&fields=${fields}`);
+          const delta = response.ok ? (await response.json()).message : null;
+          if (delta && !delta.full && !delta.catalog_building) {
+            data = { apps: this.applyCatalogDelta(cached.apps, delta), catalog_version: delta.version, settings_version: delta.settings_version };
+          }
+        }
+        
+        if (!data) {
+          const response = await fetch(`/api/method/api_explorer.core.scanner.manager.scan_apis?fields=${fields}`, {
+            headers: cached?.etag ? { 'If-None-Match': cached.etag } : {}
+          });
+          if (response.status === 304) {
+            data = { apps: cached.apps, catalog_version: cached.version, settings_version: cached.settingsVersion };
+          } else if (!response.ok) {
+            return {};
+          } else {
+            data = (await response.json()).message || {};
+            data.etag = response.headers.get('ETag');
+          }
+        }
+        
+        if (!data.catalog_building) {
+          // Settings are only sent by their own endpoint; reload them if they changed since
+          if (data.settings_version !== undefined && data.settings_version !== results.settings?.settings_version) {
+            results.settings = await this.loadSettings();
+          }
+          this.saveCachedCatalog(fields, userContext.user, data, cached);
+          return data.apps || {};
+        }
+        await new Promise(resolve => setTimeout(resolve, 2000));
       }
-      const data = await response.json();
-      return data.message?.apps || {};
+      return {};
     } catch (error) {
       return {};
     }
   }
   
+  static loadCachedCatalog(fields, user) {
+    try {
+      const cached = JSON.parse(localStorage.getItem('api_explorer_catalog') || 'null');
+      return cached && cached.fields === fields && cached.user === user && cached.version ? cached : null;
+    } catch (e) {
+      return null;
+    }
+  }
+  
+  static saveCachedCatalog(fields, user, data, cached) {
+    if (!data.catalog_version) return;
+    try {
+      localStorage.setItem('api_explorer_catalog', JSON.stringify({
+        fields,
+        user,
+        version: data.catalog_version,
+        settingsVersion: data.settings_version,
+        // A delta keeps the tag of the full response it was applied to; it is only a hint for scan_apis
+        etag: data.etag || (cached?.version === data.catalog_version ? cached.etag : null),
+        apps: data.apps
+      }));
+    } catch (e) {
+      // Storage full or unavailable; the next visit loads the whole catalog again
+    }
+  }
+  
+  static applyCatalogDelta(apps, delta) {
+    const merged = {};
+    const appNames = new Set([...Object.keys(apps), ...Object.keys(delta.changed || {})]);
+    
+    for (const app of appNames) {
+      merged[app] = {};
+      const categories = new Set([...Object.keys(apps[app] || {}), ...Object.keys(delta.changed?.[app] || {})]);
+      
+      for (const category of categories) {
+        const removed = new Set(delta.removed?.[app]?.[category] || []);
+        const changed = new Map((delta.changed?.[app]?.[category] || []).map(api => [api.path, api]));
+        
+        // Changed APIs keep their position, new ones are appended
+        const apis = (apps[app]?.[category] || [])
+          .filter(api => !removed.has(api.path))
+          .map(api => {
+            const updated = changed.get(api.path);
+            changed.delete(api.path);
+            return updated || api;
+          });
+        merged[app][category] = apis.concat([...changed.values()]);
+      }
+    }
+    return merged;
+  }
+  
   static async loadAllData(results) {
     try {
       const userContext = results.auth;